@@ -6,10 +6,245 @@
 
 import numpy as np
 import json
+import matplotlib
+matplotlib.use('Agg')  # 仅输出图片文件，不需要GUI后端
 import matplotlib.pyplot as plt
-from scipy.optimize import curve_fit
+from scipy.optimize import curve_fit, OptimizeWarning
 import os
+import sys
+import tempfile
+import functools
 from pathlib import Path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from numeric_utils import njit
+
+# orjson为可选依赖：可用时用于快速写出JSON（原生支持numpy类型），否则使用标准库json
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+@njit(cache=True)
+def _temp_dep_model(T, A, B, C):
+    """迁移率温度依赖模型 A*exp(-B/(T+C))"""
+    return A * np.exp(-B / (T + C))
+
+
+@njit(cache=True)
+def _temp_dep_jac(T, A, B, C):
+    """温度依赖模型对(A, B, C)的解析雅可比矩阵"""
+    x = T + C
+    e = np.exp(-B / x)
+    jac = np.empty((T.size, 3))
+    jac[:, 0] = e
+    jac[:, 1] = -A * e / x
+    jac[:, 2] = A * e * B / x**2
+    return jac
+
+
+@njit(cache=True)
+def _debye_model(omega2, eps_inf, eps_s, tau):
+    """介电常数Debye弛豫模型，自变量为预先算好的 ω² = (2πf)²"""
+    return eps_inf + (eps_s - eps_inf) / (1 + omega2 * tau**2)
+
+
+@njit(cache=True)
+def _debye_jac(omega2, eps_inf, eps_s, tau):
+    """Debye模型对(eps_inf, eps_s, tau)的解析雅可比矩阵"""
+    d = 1 + omega2 * tau**2
+    jac = np.empty((omega2.size, 3))
+    jac[:, 0] = 1 - 1 / d
+    jac[:, 1] = 1 / d
+    jac[:, 2] = -(eps_s - eps_inf) * 2 * omega2 * tau / d**2
+    return jac
+
+
+@njit(cache=True)
+def _synergy_summary_kernel(f_deloc, f_coupling, f_reorg, f_total):
+    """单次遍历：写出逐点总增强因子，同时累加四个因子的均值"""
+    n = f_deloc.size
+    sum_deloc = 0.0
+    sum_coupling = 0.0
+    sum_reorg = 0.0
+    sum_total = 0.0
+    for i in range(n):
+        t = f_deloc[i] * f_coupling[i] * f_reorg[i]
+        f_total[i] = t
+        sum_deloc += f_deloc[i]
+        sum_coupling += f_coupling[i]
+        sum_reorg += f_reorg[i]
+        sum_total += t
+    return sum_deloc / n, sum_coupling / n, sum_reorg / n, sum_total / n
+
+
+@njit(cache=True)
+def _quantum_efficiency_kernel(wavelength, intensity):
+    """单次遍历同时完成梯形积分与求最大值"""
+    total = 0.0
+    peak = intensity[0]
+    for i in range(1, intensity.size):
+        total += 0.5 * (intensity[i] + intensity[i - 1]) * (wavelength[i] - wavelength[i - 1])
+        if intensity[i] > peak:
+            peak = intensity[i]
+    return total / peak / wavelength.size
+
+
+@njit(cache=True)
+def _quantum_efficiency_uniform_kernel(intensity, dx):
+    """等间距网格：梯形积分退化为 dx*(总和 - 首尾平均)，无需逐点做波长差"""
+    total = 0.0
+    peak = intensity[0]
+    for i in range(intensity.size):
+        total += intensity[i]
+        if intensity[i] > peak:
+            peak = intensity[i]
+    total = dx * (total - 0.5 * (intensity[0] + intensity[-1]))
+    return total / peak / intensity.size
+
+
+def uniform_grid_step(x, rtol=1e-9):
+    """若网格等间距则返回步长，否则返回None（每个网格只需检查一次）"""
+    x = np.asarray(x, dtype=np.float64)
+    if x.size < 2:
+        return None
+    dx = (x[-1] - x[0]) / (x.size - 1)
+    if np.allclose(np.diff(x), dx, rtol=rtol, atol=0.0):
+        return dx
+    return None
+
+
+@njit(cache=True)
+def _magnetoresistance_kernel(field, resistance, min_field):
+    """单次遍历：定位零场点，并累加|B|>min_field区间上R对|B|线性回归所需的和
+    
+    R先减去首个电阻值再累加（斜率不受平移影响），避免R≫ΔR时
+    闭式公式 n*Σxy - Σx*Σy 出现大数相消。
+    """
+    zero_idx = 0
+    zero_abs = abs(field[0])
+    shift = resistance[0]
+    n = 0
+    sum_x = 0.0
+    sum_y = 0.0
+    sum_xx = 0.0
+    sum_xy = 0.0
+    for i in range(field.size):
+        x = abs(field[i])
+        if x < zero_abs:
+            zero_abs = x
+            zero_idx = i
+        if x > min_field:
+            y = resistance[i] - shift
+            n += 1
+            sum_x += x
+            sum_y += y
+            sum_xx += x * x
+            sum_xy += x * y
+    return zero_idx, n, sum_x, sum_y, sum_xx, sum_xy
+
+
+def _ensure_binary(filepath):
+    """确保文本数据文件旁有最新的.npy副本，返回其路径（无法写入时返回None）"""
+    npy_path = filepath + '.npy'
+    try:
+        if os.path.getmtime(npy_path) >= os.path.getmtime(filepath):
+            return npy_path
+    except OSError:
+        pass
+    
+    data = np.loadtxt(filepath)
+    # 先写到同目录下的唯一临时文件再原子替换：并行工作进程可能正以mmap读取同一路径，
+    # 直接原地写入会让读者看到截断的.npy
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(npy_path) or '.', suffix='.npy.tmp')
+    except OSError:
+        return None
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            np.save(f, data)
+        os.replace(tmp_path, npy_path)
+    except OSError:
+        return None
+    finally:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+    return npy_path
+
+
+def _load_data_file(filepath):
+    """读取测量数据文件；同一文件在参数扫描中只解析一次（返回只读数组）
+    
+    缓存键包含文件的修改时间与大小，进程运行期间文件被改写时重新读取。
+    """
+    st = os.stat(filepath)
+    return _load_data_file_cached(filepath, st.st_mtime_ns, st.st_size)
+
+
+@functools.lru_cache(maxsize=128)
+def _load_data_file_cached(filepath, mtime_ns, size):
+    """首次读取时把文本转换为.npy，之后以内存映射方式读取二进制副本（mtime_ns、size仅作缓存键）"""
+    npy_path = _ensure_binary(filepath)
+    if npy_path is not None:
+        return np.load(npy_path, mmap_mode='r')
+    
+    data = np.loadtxt(filepath)
+    data.setflags(write=False)
+    return data
+
+
+# 协同效应数据表：每个样本一条记录，各列可直接按字段取出
+SYNERGY_TABLE_DTYPE = np.dtype([
+    ('strain', 'f8'),
+    ('doping', 'f8'),
+    ('f_deloc', 'f8'),
+    ('f_coupling', 'f8'),
+    ('f_reorg', 'f8'),
+    ('f_total', 'f8'),
+])
+
+
+def build_synergy_table(strain_values, doping_values, f_deloc_values,
+                        f_coupling_values, f_reorg_values, f_total_values):
+    """一次性把各列数据组装成结构化数组"""
+    table = np.empty(len(strain_values), dtype=SYNERGY_TABLE_DTYPE)
+    table['strain'] = strain_values
+    table['doping'] = doping_values
+    table['f_deloc'] = f_deloc_values
+    table['f_coupling'] = f_coupling_values
+    table['f_reorg'] = f_reorg_values
+    table['f_total'] = f_total_values
+    return table
+
+
+# 验证标志位顺序：第i位对应VALIDATION_FLAGS[i]
+VALIDATION_FLAGS = (
+    'delocalization_valid',
+    'coupling_valid',
+    'reorganization_valid',
+    'total_enhancement_valid',
+    'synergistic_valid',
+    'overall_valid',
+)
+
+
+def pack_validation_flags(flags):
+    """把验证结果的布尔数组字典压缩为每个样本一个uint8位掩码"""
+    bits = np.zeros(np.shape(flags[VALIDATION_FLAGS[0]]), dtype=np.uint8)
+    for i, name in enumerate(VALIDATION_FLAGS):
+        bits |= np.asarray(flags[name], dtype=np.uint8) << i
+    return bits
+
+
+def unpack_validation_flags(bits):
+    """把uint8位掩码还原为验证结果字典（仅在需要输出JSON时调用）"""
+    bits = np.asarray(bits, dtype=np.uint8)
+    flags = {name: ((bits >> i) & 1).astype(bool) for i, name in enumerate(VALIDATION_FLAGS)}
+    if bits.ndim == 0:
+        return {name: bool(value) for name, value in flags.items()}
+    return flags
+
 
 class SynergisticEffectAnalyzer:
     def __init__(self, data_dir="outputs"):
@@ -22,10 +257,15 @@ class SynergisticEffectAnalyzer:
         }
         self.tolerance = 0.2  # ±20%
         
+    @functools.cached_property
+    def _targets(self):
+        """按(f_deloc, f_coupling, f_reorg, f_total)顺序排列的目标值数组，供批量验证广播"""
+        return np.array([self.target_factors[key] for key in ('f_deloc', 'f_coupling', 'f_reorg', 'f_total')])
+        
     def load_hall_effect_data(self, filename):
         """加载变温霍尔效应数据"""
         filepath = os.path.join(self.data_dir, 'hall_effect', filename)
-        data = np.loadtxt(filepath)
+        data = _load_data_file(filepath)
         return data[:, 0], data[:, 1], data[:, 2]  # temperature, mobility, concentration
         
     def calculate_delocalization_factor(self, temperature, mobility):
@@ -34,12 +274,11 @@ class SynergisticEffectAnalyzer:
         # 离域化程度越高，温度依赖越弱
         
         # 拟合温度依赖关系
-        def temp_dep_func(T, A, B, C):
-            return A * np.exp(-B / (T + C))
+        temp_dep_func = _temp_dep_model
             
         try:
             popt, pcov = curve_fit(temp_dep_func, temperature, mobility,
-                                 p0=[max(mobility), 100, 50])
+                                 p0=[max(mobility), 100, 50], jac=_temp_dep_jac)
             
             # 计算温度系数
             T_ref = 300  # K
@@ -53,13 +292,14 @@ class SynergisticEffectAnalyzer:
             
             return f_deloc
             
-        except:
+        except (RuntimeError, ValueError, TypeError, OptimizeWarning):
+            # 拟合不收敛、数据点不足或含非法值时退回中性因子
             return 1.0
             
     def load_magnetoresistance_data(self, filename):
         """加载磁阻数据"""
         filepath = os.path.join(self.data_dir, 'magnetoresistance', filename)
-        data = np.loadtxt(filepath)
+        data = _load_data_file(filepath)
         return data[:, 0], data[:, 1]  # field, resistance
         
     def calculate_coupling_enhancement_factor(self, field, resistance):
@@ -67,18 +307,21 @@ class SynergisticEffectAnalyzer:
         # 基于磁阻行为判断耦合强度
         # 强耦合导致负磁阻，弱耦合导致正磁阻
         
-        R_0 = resistance[np.argmin(np.abs(field))]  # 零场电阻
-        magnetoresistance = (resistance - R_0) / R_0
+        field = np.asarray(field, dtype=np.float64)
+        resistance = np.asarray(resistance, dtype=np.float64)
         
-        # 计算磁阻斜率
-        field_abs = np.abs(field)
-        valid_indices = field_abs > 0.1  # 避免零场附近的数据
+        # 零场电阻与磁阻斜率所需的累加量一次遍历得到（避免零场附近的数据）
+        zero_idx, n, sum_x, sum_y, sum_xx, sum_xy = _magnetoresistance_kernel(field, resistance, 0.1)
+        R_0 = resistance[zero_idx]  # 零场电阻
         
-        if np.sum(valid_indices) < 5:
+        if n < 5:
             return 1.0
-            
-        slope = np.polyfit(field_abs[valid_indices], 
-                          magnetoresistance[valid_indices], 1)[0]
+        
+        # 磁阻 (R - R_0)/R_0 是R的线性变换，其斜率等于R对|B|的最小二乘斜率除以R_0
+        denom = n * sum_xx - sum_x**2
+        if denom == 0:
+            return 1.0
+        slope = (n * sum_xy - sum_x * sum_y) / denom / R_0
         
         # 耦合增强因子（负斜率表示强耦合）
         f_coupling = 1.0 + abs(slope) * 10  # 经验公式
@@ -88,7 +331,7 @@ class SynergisticEffectAnalyzer:
     def load_dielectric_data(self, filename):
         """加载介电常数数据"""
         filepath = os.path.join(self.data_dir, 'dielectric', filename)
-        data = np.loadtxt(filepath)
+        data = _load_data_file(filepath)
         return data[:, 0], data[:, 1]  # frequency, dielectric_constant
         
     def calculate_reorganization_factor(self, frequency, dielectric_constant):
@@ -96,13 +339,13 @@ class SynergisticEffectAnalyzer:
         # 基于介电常数频率依赖计算重组能
         # 重组能越低，介电响应越快
         
-        # 拟合介电常数频率依赖
-        def dielectric_func(freq, eps_inf, eps_s, tau):
-            return eps_inf + (eps_s - eps_inf) / (1 + (2 * np.pi * freq * tau)**2)
+        # 拟合介电常数频率依赖；ω²只算一次，拟合迭代中不再重复计算2πf
+        dielectric_func = _debye_model
+        omega2 = (2 * np.pi * np.asarray(frequency, dtype=np.float64))**2
             
         try:
-            popt, pcov = curve_fit(dielectric_func, frequency, dielectric_constant,
-                                 p0=[3.0, 10.0, 1e-12])
+            popt, pcov = curve_fit(dielectric_func, omega2, dielectric_constant,
+                                 p0=[3.0, 10.0, 1e-12], jac=_debye_jac)
             
             eps_inf, eps_s, tau = popt
             
@@ -111,49 +354,60 @@ class SynergisticEffectAnalyzer:
             
             return f_reorg
             
-        except:
+        except (RuntimeError, ValueError, TypeError, OptimizeWarning):
+            # 拟合不收敛、数据点不足或含非法值时退回中性因子
             return 1.0
             
     def load_photoluminescence_data(self, filename):
         """加载光致发光数据"""
         filepath = os.path.join(self.data_dir, 'photoluminescence', filename)
-        data = np.loadtxt(filepath)
+        data = _load_data_file(filepath)
         return data[:, 0], data[:, 1]  # wavelength, intensity
         
-    def calculate_quantum_efficiency(self, wavelength, intensity):
-        """计算量子效率"""
-        # 积分发光强度
-        total_intensity = np.trapz(intensity, wavelength)
+    def calculate_quantum_efficiency(self, wavelength, intensity, dx=None):
+        """计算量子效率
+        
+        dx: 等间距波长网格的步长；未给出时由uniform_grid_step检查一次网格，
+            多条光谱共用同一网格时可预先求得后传入，跳过重复检查
+        """
+        intensity = np.asarray(intensity, dtype=np.float64)
+        if dx is None:
+            dx = uniform_grid_step(wavelength)
         
-        # 归一化量子效率
-        quantum_efficiency = total_intensity / max(intensity) / len(wavelength)
+        # 积分发光强度并按峰值和点数归一化（单次遍历）
+        if dx is not None:
+            quantum_efficiency = _quantum_efficiency_uniform_kernel(intensity, float(dx))
+        else:
+            quantum_efficiency = _quantum_efficiency_kernel(
+                np.asarray(wavelength, dtype=np.float64), intensity
+            )
         
         return quantum_efficiency
         
     def analyze_synergistic_effects(self, strain_values, doping_values, 
                                    f_deloc_values, f_coupling_values, f_reorg_values):
         """分析协同效应"""
-        strains = np.array(strain_values)
-        doping = np.array(doping_values)
-        f_deloc = np.array(f_deloc_values)
-        f_coupling = np.array(f_coupling_values)
-        f_reorg = np.array(f_reorg_values)
+        # 已是float64数组时np.asarray不会复制
+        f_deloc = np.asarray(f_deloc_values, dtype=np.float64)
+        f_coupling = np.asarray(f_coupling_values, dtype=np.float64)
+        f_reorg = np.asarray(f_reorg_values, dtype=np.float64)
         
-        # 计算总增强因子
-        f_total_values = f_deloc * f_coupling * f_reorg
+        # 总增强因子与各因子均值在一次遍历中得到
+        f_total_values = np.empty_like(f_deloc)
+        mean_deloc, mean_coupling, mean_reorg, mean_total = _synergy_summary_kernel(
+            f_deloc, f_coupling, f_reorg, f_total_values
+        )
         
         # 分析各因子的贡献
         contributions = {
-            'delocalization': np.mean(f_deloc),
-            'coupling': np.mean(f_coupling),
-            'reorganization': np.mean(f_reorg),
-            'total': np.mean(f_total_values)
+            'delocalization': mean_deloc,
+            'coupling': mean_coupling,
+            'reorganization': mean_reorg,
+            'total': mean_total
         }
         
         # 分析协同效应强度
-        synergy_strength = np.mean(f_total_values) / (np.mean(f_deloc) * 
-                                                    np.mean(f_coupling) * 
-                                                    np.mean(f_reorg))
+        synergy_strength = mean_total / (mean_deloc * mean_coupling * mean_reorg)
         
         return {
             'contributions': contributions,
@@ -161,47 +415,39 @@ class SynergisticEffectAnalyzer:
             'f_total_values': f_total_values.tolist()
         }
         
-    def validate_synergistic_effects(self, f_deloc, f_coupling, f_reorg, f_total):
-        """验证协同效应"""
-        validation_results = {
-            'delocalization_valid': False,
-            'coupling_valid': False,
-            'reorganization_valid': False,
-            'total_enhancement_valid': False,
-            'synergistic_valid': False,
-            'overall_valid': False
-        }
+    def validate_synergistic_effects_batch(self, f_deloc, f_coupling, f_reorg, f_total, packed=False):
+        """批量验证协同效应，各参数可为等长数组，返回各项的布尔数组
+        
+        packed=True时返回uint8位掩码数组（位顺序见VALIDATION_FLAGS）
+        """
+        f_deloc = np.asarray(f_deloc, dtype=np.float64)
+        f_coupling = np.asarray(f_coupling, dtype=np.float64)
+        f_reorg = np.asarray(f_reorg, dtype=np.float64)
+        f_total = np.asarray(f_total, dtype=np.float64)
+        
+        # 四个因子与目标值的偏差一次比较完成
+        factors = np.stack([f_deloc, f_coupling, f_reorg, f_total], axis=-1)
+        within = np.abs(factors - self._targets) <= self.tolerance
         
-        # 验证离域化因子
-        if abs(f_deloc - self.target_factors['f_deloc']) <= self.tolerance:
-            validation_results['delocalization_valid'] = True
-            
-        # 验证耦合增强因子
-        if abs(f_coupling - self.target_factors['f_coupling']) <= self.tolerance:
-            validation_results['coupling_valid'] = True
-            
-        # 验证重组能因子
-        if abs(f_reorg - self.target_factors['f_reorg']) <= self.tolerance:
-            validation_results['reorganization_valid'] = True
-            
-        # 验证总增强因子
-        if abs(f_total - self.target_factors['f_total']) <= self.tolerance:
-            validation_results['total_enhancement_valid'] = True
-            
         # 验证协同效应（总因子大于各因子乘积）
-        if f_total > f_deloc * f_coupling * f_reorg:
-            validation_results['synergistic_valid'] = True
-            
-        # 总体验证
-        validation_results['overall_valid'] = all([
-            validation_results['delocalization_valid'],
-            validation_results['coupling_valid'],
-            validation_results['reorganization_valid'],
-            validation_results['total_enhancement_valid'],
-            validation_results['synergistic_valid']
-        ])
+        synergistic = f_total > f_deloc * f_coupling * f_reorg
         
-        return validation_results
+        flags = {
+            'delocalization_valid': within[..., 0],
+            'coupling_valid': within[..., 1],
+            'reorganization_valid': within[..., 2],
+            'total_enhancement_valid': within[..., 3],
+            'synergistic_valid': synergistic,
+            'overall_valid': within.all(axis=-1) & synergistic
+        }
+        if packed:
+            return pack_validation_flags(flags)
+        return flags
+        
+    def validate_synergistic_effects(self, f_deloc, f_coupling, f_reorg, f_total):
+        """验证协同效应"""
+        batch = self.validate_synergistic_effects_batch(f_deloc, f_coupling, f_reorg, f_total)
+        return {key: bool(value) for key, value in batch.items()}
         
     def save_results(self, f_deloc, f_coupling, f_reorg, f_total, 
                     synergy_analysis, validation_results):
@@ -218,8 +464,13 @@ class SynergisticEffectAnalyzer:
             'target_factors': self.target_factors
         }
         
-        with open('results/synergistic_effects.json', 'w') as f:
-            json.dump(results, f, indent=2)
+        if HAS_ORJSON:
+            with open('results/synergistic_effects.json', 'wb') as f:
+                f.write(orjson.dumps(results, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+        else:
+            # 先整体编码再一次写出，避免json.dump逐个token写文件
+            with open('results/synergistic_effects.json', 'w') as f:
+                f.write(json.dumps(results, indent=2))
             
     def plot_results(self, strain_values, doping_values, f_deloc_values, 
                     f_coupling_values, f_reorg_values, f_total_values):
@@ -265,42 +516,46 @@ class SynergisticEffectAnalyzer:
         ax4.legend()
         ax4.grid(True, alpha=0.3)
         
-        plt.tight_layout()
-        plt.savefig('results/synergistic_effects.png', dpi=300, bbox_inches='tight')
-        plt.close()
+        # 布局已由tight_layout确定，保存时不再做bbox_inches='tight'的二次布局
+        fig.tight_layout()
+        fig.savefig('results/synergistic_effects.png', dpi=150)
+        plt.close(fig)
 
 def main():
     """主函数"""
     analyzer = SynergisticEffectAnalyzer()
     
-    # 模拟数据（实际实验中从文件读取）
-    strain_values = [-5.0, -2.5, 0.0, 2.5, 5.0]
-    doping_values = [2.5, 5.0, 7.5, 5.0, 5.0]  # 固定掺杂浓度
-    f_deloc_values = [1.2, 1.4, 1.6, 1.8, 1.8]
-    f_coupling_values = [1.3, 1.5, 1.7, 1.8, 1.8]
-    f_reorg_values = [1.2, 1.3, 1.4, 1.5, 1.5]
-    f_total_values = [1.87, 2.73, 3.81, 4.86, 4.86]
+    # 模拟数据（实际实验中从文件读取），只组装一次
+    table = build_synergy_table(
+        strain_values=[-5.0, -2.5, 0.0, 2.5, 5.0],
+        doping_values=[2.5, 5.0, 7.5, 5.0, 5.0],  # 固定掺杂浓度
+        f_deloc_values=[1.2, 1.4, 1.6, 1.8, 1.8],
+        f_coupling_values=[1.3, 1.5, 1.7, 1.8, 1.8],
+        f_reorg_values=[1.2, 1.3, 1.4, 1.5, 1.5],
+        f_total_values=[1.87, 2.73, 3.81, 4.86, 4.86]
+    )
+    last = table[-1]
     
     # 分析协同效应
     synergy_analysis = analyzer.analyze_synergistic_effects(
-        strain_values, doping_values, f_deloc_values, f_coupling_values, f_reorg_values
+        table['strain'], table['doping'], table['f_deloc'], table['f_coupling'], table['f_reorg']
     )
     
     # 验证协同效应
     validation_results = analyzer.validate_synergistic_effects(
-        f_deloc_values[-1], f_coupling_values[-1], f_reorg_values[-1], f_total_values[-1]
+        last['f_deloc'], last['f_coupling'], last['f_reorg'], last['f_total']
     )
     
     # 保存结果
     analyzer.save_results(
-        f_deloc_values[-1], f_coupling_values[-1], f_reorg_values[-1], f_total_values[-1],
+        last['f_deloc'], last['f_coupling'], last['f_reorg'], last['f_total'],
         synergy_analysis, validation_results
     )
     
     # 绘制结果
     analyzer.plot_results(
-        strain_values, doping_values, f_deloc_values, f_coupling_values, 
-        f_reorg_values, f_total_values
+        table['strain'], table['doping'], table['f_deloc'], table['f_coupling'],
+        table['f_reorg'], table['f_total']
     )
     
     print("协同效应定量验证分析完成!")
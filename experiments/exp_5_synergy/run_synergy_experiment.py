@@ -6,84 +6,382 @@
 
 import numpy as np
 import json
-import matplotlib.pyplot as plt
 from pathlib import Path
 import subprocess
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import logging
+import array
+import functools
+import gzip
+import hashlib
+import zlib
+import mmap
+import re
+import shutil
+import itertools
+import multiprocessing
+from collections import defaultdict
+from random import Random
 from typing import Dict, List, Tuple
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from c60_coordinates import format_c60_coordinates_for_cp2k
 from qhp_c60_structures import (
     format_multi_c60_coordinates_for_cp2k,
     get_supercell_dimensions,
-    get_multi_c60_coordinates,
-    create_substitutional_doped_structure,
-    format_coords_for_cp2k
 )
+from numeric_utils import HAS_NUMBA, njit, to_builtin
+
+# ExPyRe为可选依赖：可用时支持把每个DFT计算作为队列作业提交到HPC调度系统
+try:
+    from expyre import ExPyRe
+    HAS_EXPYRE = True
+except ImportError:
+    HAS_EXPYRE = False
+
+# orjson为可选依赖：可用时用于快速写出JSON（原生支持numpy类型），否则使用标准库json
+try:
+    import orjson
+    # OPT_NON_STR_KEYS: 与标准库json一致，允许数值（如应变）作为字典键
+    _ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
 # 设置日志
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-class SynergyExperimentRunner:
-    """协同效应定量验证实验运行器"""
+
+def _available_cpus() -> int:
+    """本进程可用的CPU数（遵循taskset/cgroup绑定，HPC节点上常小于os.cpu_count()）"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+@functools.lru_cache(maxsize=None)
+def _mpi_flavor() -> str:
+    """识别mpirun所属的MPI实现（'openmpi'/'mpich'/'intel'），无法识别时返回空串；每个进程只探测一次"""
+    try:
+        proc = subprocess.run(['mpirun', '--version'], capture_output=True, text=True, timeout=30)
+    except (OSError, subprocess.SubprocessError):
+        return ''
+    version = proc.stdout + proc.stderr
+    if 'Intel(R) MPI' in version:
+        return 'intel'
+    if 'Open MPI' in version or 'OpenRTE' in version:
+        return 'openmpi'
+    if 'HYDRA' in version or 'MPICH' in version:
+        return 'mpich'
+    return ''
+
+
+
+@functools.lru_cache(maxsize=None)
+def _cp2k_build_id(cp2k_exe: str) -> str:
+    """CP2K构建标识：可执行文件的修改时间与大小 + `--version` 输出；每个进程只探测一次
     
-    def __init__(self, project_root: str = "."):
-        self.project_root = Path(project_root).resolve()
-        self.experiment_dir = self.project_root / "experiments" / "exp_5_synergy"
-        self.hpc_dir = self.project_root / "hpc_calculations"
-        
-        # 多C60分子体系配置 - 用于研究分子间协同效应
-        self.num_c60_molecules = 4  # 使用4个C60分子研究协同效应
-        
-        # 理论预测值 - 严格按照论文要求
-        self.theoretical_predictions = {
-            'delocalization_factor': 1.8,  # f_deloc
-            'coupling_enhancement_factor': 1.8,  # f_coupling
-            'reorganization_factor': 1.5,  # f_reorg
-            'total_enhancement_factor': 8.75,  # f_total
-            'synergistic_threshold': 3.0,  # 论文要求: >300%迁移率增强
-            'tolerance_factor': 0.2  # ±20%
-        }
-        
-        # 测试配置 - 按论文要求使用B/N/P替代性掺杂
-        self.strain_values = [-5.0, -2.5, 0.0, 2.5, 3.0, 5.0]  # % (添加3%最优应变点)
-        self.doping_types = ['pristine', 'B', 'N', 'P']  # 论文要求: B/N/P替代性掺杂
-        self.doping_concentrations = [0.025, 0.05, 0.075]  # 论文要求: 2.5%, 5%, 7.5%
-        self.doping_concentration = 0.05  # 默认5%浓度 (论文最优配置)
-        
-        # 创建必要的目录
-        self.experiment_dir.mkdir(parents=True, exist_ok=True)
-        (self.experiment_dir / "outputs").mkdir(exist_ok=True)
-        (self.experiment_dir / "results").mkdir(exist_ok=True)
-        (self.experiment_dir / "figures").mkdir(exist_ok=True)
+    同一路径上重新编译或升级CP2K后标识随之改变，旧的结果缓存不再被复用。
+    """
+    resolved = shutil.which(cp2k_exe) or cp2k_exe
+    parts = []
+    try:
+        st = os.stat(resolved)
+        parts.append(f"{st.st_mtime_ns}:{st.st_size}")
+    except OSError:
+        pass
+    try:
+        proc = subprocess.run([resolved, '--version'], capture_output=True, text=True, timeout=60)
+        parts.append(proc.stdout)
+    except (OSError, subprocess.SubprocessError):
+        pass
+    return "\n".join(parts)
+
+@njit(cache=True)
+def _synergy_factor_kernel(strain_changes, doping_changes, combined_changes):
+    """
+    协同因子内核: 组合效应变化 / (应变单独 + 掺杂单独) 变化
     
-    def create_dft_input_files(self):
-        """创建DFT输入文件"""
-        logger.info("创建DFT输入文件...")
-        
-        for strain in self.strain_values:
-            for dopant in self.doping_types:
-                if dopant == 'pristine':
-                    input_file = self.experiment_dir / "outputs" / f"C60_strain_{strain:+.1f}_pristine_synergy.inp"
-                    self._create_pristine_input(input_file, strain)
-                else:
-                    input_file = self.experiment_dir / "outputs" / f"C60_strain_{strain:+.1f}_{dopant}_doped_synergy.inp"
-                    self._create_doped_input(input_file, strain, dopant)
-                
-                logger.info(f"创建输入文件: {input_file}")
+    strain_changes, doping_changes: (3,) 依次为 IPR/J/λ 的变化幅度
+    combined_changes: (n, 3) 每种掺杂的组合效应变化幅度
+    返回 (n, 4): f_deloc, f_coupling, f_reorg, f_total
+    """
+    n = combined_changes.shape[0]
+    factors = np.empty((n, 4))
+    for i in range(n):
+        f_total = 1.0
+        for j in range(3):
+            expected = strain_changes[j] + doping_changes[j]
+            f = combined_changes[i, j] / expected if expected > 0 else 1.0
+            factors[i, j] = f
+            f_total *= f
+        factors[i, 3] = f_total
+    return factors
+
+
+@njit(cache=True)
+def _effect_range_kernel(values):
+    """每列的变化幅度 max - min（values: (n, 3) 依次为 IPR/J/λ）"""
+    n, m = values.shape
+    ranges = np.empty(m)
+    for j in range(m):
+        lo = values[0, j]
+        hi = values[0, j]
+        for i in range(1, n):
+            v = values[i, j]
+            if v < lo:
+                lo = v
+            elif v > hi:
+                hi = v
+        ranges[j] = hi - lo
+    return ranges
+
+
+def _warm_up_kernels():
+    """用长度为1的数组触发一次JIT编译（cache=True时直接读取磁盘缓存），避免首次分析时计入编译耗时"""
+    one = np.ones(3)
+    _synergy_factor_kernel(one, one, one.reshape(1, 3))
+    _effect_range_kernel(one.reshape(1, 3))
+
+
+def _compact_numeric(obj, ndigits: int = 6):
+    """压缩数值精度：浮点数保留ndigits位小数，float64数组降为float32（下游不需要17位有效数字）"""
+    if isinstance(obj, dict):
+        return {k: _compact_numeric(v, ndigits) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_compact_numeric(v, ndigits) for v in obj]
+    if isinstance(obj, (float, np.floating)):
+        return round(float(obj), ndigits)
+    if isinstance(obj, np.ndarray) and obj.dtype == np.float64:
+        # orjson 按float32最短表示输出；json 回退路径下float32.tolist()反而会变长，直接取舍入后的列表
+        return obj.astype(np.float32) if HAS_ORJSON else np.round(obj, ndigits).tolist()
+    return obj
+
+
+def _dump_json(obj, path: Path, compact: bool = False, indent: bool = False):
+    """
+    一次性写出JSON文件（优先orjson，直接序列化numpy类型，无需预先逐层转换）；.gz后缀时gzip压缩
     
-    def _create_pristine_input(self, input_file: Path, strain: float):
-        """创建未掺杂的协同效应计算输入文件"""
-        # 根据应变计算晶格参数 - 使用多分子超胞
-        lattice_a, lattice_b, lattice_c = get_supercell_dimensions(self.num_c60_molecules)
-        lattice_a *= (1 + strain/100)
-        lattice_b *= (1 + strain/100)
-        
-        input_content = f"""&GLOBAL
+    默认输出紧凑JSON（供程序读取的大文件缩进空白占了大部分编码时间），indent=True 时缩进2格供人阅读
+    """
+    if compact:
+        obj = _compact_numeric(obj)
+    if HAS_ORJSON:
+        data = orjson.dumps(obj, option=_ORJSON_OPTIONS | orjson.OPT_INDENT_2 if indent else _ORJSON_OPTIONS)
+    elif indent:
+        data = json.dumps(obj, indent=2, default=to_builtin).encode('utf-8')
+    else:
+        data = json.dumps(obj, separators=(',', ':'), default=to_builtin).encode('utf-8')
+    if path.suffix == '.gz':
+        # 大量重复的键名/数值文本，最快压缩级别即可缩小数倍
+        data = gzip.compress(data, compresslevel=1)
+    path.write_bytes(data)
+
+
+def _load_if_exists(path: Path):
+    """读取 _dump_json 写出的JSON文件（与写出对称：优先orjson，.gz后缀时先解压）；文件不存在时返回None"""
+    try:
+        data = path.read_bytes()
+    except FileNotFoundError:
+        return None
+    if path.suffix == '.gz':
+        data = gzip.decompress(data)
+    return orjson.loads(data) if HAS_ORJSON else json.loads(data)
+
+
+# 失败计算保留的stderr末尾长度（CP2K崩溃时stderr可达数MB）
+_STDERR_TAIL_CHARS = 8192
+
+
+def _tail_err(stderr: bytes, n: int = _STDERR_TAIL_CHARS) -> str:
+    """只解码stderr的最后n个字节"""
+    return stderr[-n:].decode('utf-8', errors='replace') if stderr else ''
+
+
+# 超过该大小的CP2K输出用mmap解析（小文件逐行读取更省事）
+_MMAP_PARSE_THRESHOLD = 1 << 20
+
+
+def _pyplot():
+    """按需导入pyplot：只生成输入文件或跳过绘图（SYNERGY_NOPLOT）时不承担matplotlib的导入开销"""
+    import matplotlib
+    matplotlib.use('Agg')  # 仅输出图片文件，不需要GUI后端
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def _drop_page_cache(path: Path):
+    """提示内核该文件近期不会再读取，释放其页缓存（仅支持posix_fadvise的平台，如Linux）"""
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    try:
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        finally:
+            os.close(fd)
+    except OSError:
+        pass
+
+
+# MO能级行中紧接在 "eV" 之前的数值字段（按空白分隔的完整字段匹配，与逐字段扫描等价）
+_MO_EV_RE = re.compile(r'(?<!\S)(\S+)\s+eV(?!\S)')
+
+
+def _last_line_value(mm: mmap.mmap, keywords: Tuple[bytes, ...], convert, at_line_start: bool = False):
+    """
+    从映射末尾向前查找包含任一关键字的行，返回最后一个能转换成功的行末字段（都不成功时返回None）
+    
+    总能量、原子数等标量以最后一次出现为准，从后往前找通常第一行就命中，不必扫描整个文件
+    """
+    end = len(mm)
+    while True:
+        idx = max(mm.rfind(keyword, 0, end) for keyword in keywords)
+        if idx < 0:
+            return None
+        start = mm.rfind(b'\n', 0, idx) + 1
+        stop = mm.find(b'\n', idx)
+        line = mm[start:stop if stop >= 0 else len(mm)].decode('utf-8', errors='replace')
+        if not at_line_start or line.lstrip().startswith(keywords[0].decode()):
+            try:
+                return convert(line.split()[-1])
+            except ValueError:
+                pass
+        end = start
+
+
+# 大文件路径中MO能级行与Mulliken原子行直接用正则在映射上批量提取，不经过Python逐行循环
+# (以换行符开头的模式可走正则的字面前缀快速扫描；文件首行单独匹配)
+_MAPPED_MO_LINE_RE = re.compile(rb'\n[ \t]*MO\|[^\n]*')
+_MAPPED_FIRST_MO_LINE_RE = re.compile(rb'[ \t]*MO\|[^\n]*')
+_MAPPED_MO_EV_RE = re.compile(rb'(?<!\S)(\S+)[ \t]+eV(?!\S)')
+# Mulliken块内：首字段为整数且至少4个字段的行，取最后一个字段（净电荷）
+_MAPPED_MULLIKEN_ROW_RE = re.compile(rb'(?m)^[ \t]*\d+(?:[ \t]+\S+){2,}[ \t]+(\S+)[ \t\r]*$')
+
+
+def _to_floats(fields) -> List[float]:
+    """批量转换为浮点数，跳过无法解析的字段"""
+    try:
+        return list(map(float, fields))
+    except ValueError:
+        values = []
+        for field in fields:
+            try:
+                values.append(float(field))
+            except ValueError:
+                pass
+        return values
+
+
+def _mapped_mo_and_mulliken(mm: mmap.mmap) -> Tuple[List[float], List[float]]:
+    """从映射的CP2K输出中按文件顺序提取全部MO能级与Mulliken净电荷"""
+    mo_lines = _MAPPED_MO_LINE_RE.findall(mm)
+    first = _MAPPED_FIRST_MO_LINE_RE.match(mm)
+    if first:
+        mo_lines.insert(0, first.group())
+    eigenvalues = _to_floats(_MAPPED_MO_EV_RE.findall(b'\n'.join(mo_lines)))
+    
+    # Mulliken块: 标题行之后一直到 'Total charge' 所在行之前（没有则到文件末尾）
+    charges = []
+    idx = mm.find(b'Mulliken Population Analysis')
+    while idx >= 0:
+        start = mm.find(b'\n', idx) + 1
+        if start == 0:
+            break
+        total_idx = mm.find(b'Total charge', start)
+        end = len(mm) if total_idx < 0 else max(start, mm.rfind(b'\n', start, total_idx))
+        charges += _to_floats(_MAPPED_MULLIKEN_ROW_RE.findall(mm[start:end]))
+        if total_idx < 0:
+            break
+        idx = mm.find(b'Mulliken Population Analysis', total_idx)
+    return eigenvalues, charges
+
+
+def _run_cp2k_remote(cp2k_exe: str, input_name: str, nprocs: int, timeout: int):
+    """在队列作业中运行CP2K（由ExPyRe在计算节点调用，输入文件已暂存到当前目录）"""
+    cmd = ['mpirun', '-np', str(nprocs), cp2k_exe, '-i', input_name]
+    result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+    # 只回传失败时stderr的末尾部分，避免把大段MPI/CP2K报错整体传回
+    stderr = result.stderr[-_STDERR_TAIL_CHARS:] if result.returncode != 0 else ''
+    return result.returncode, result.stdout, stderr
+
+
+# 图表分辨率：布局已由 fig.tight_layout() 确定，保存时不再做 bbox_inches='tight' 的二次布局
+_PLOT_DPI = 150
+
+# 验证结果的 ✓/✗ 标记，以及总结日志/验证面板中各指标的显示名称
+_TICK = {True: '✓', False: '✗'}
+_VALIDATION_LABELS = (
+    ('delocalization_factor_valid', '离域化因子验证'),
+    ('coupling_enhancement_valid', '耦合增强验证'),
+    ('reorganization_factor_valid', '重组能因子验证'),
+    ('total_enhancement_valid', '总增强因子验证'),
+    ('synergistic_effect_valid', '协同效应验证'),
+    ('overall_valid', '总体验证'),
+)
+_PLOT_VALIDATION_LABELS = (
+    ('delocalization_factor_valid', 'Delocalization Factor Valid'),
+    ('coupling_enhancement_valid', 'Coupling Enhancement Valid'),
+    ('reorganization_factor_valid', 'Reorganization Factor Valid'),
+    ('total_enhancement_valid', 'Total Enhancement Valid'),
+    ('overall_valid', 'Overall Valid'),
+)
+
+# DFT输出解析结果的字段及默认值（每次解析复制一份再填充）
+_OUTPUT_INFO_DEFAULTS = {
+    'total_energy': None,
+    'homo_energy': None,
+    'lumo_energy': None,
+    'homo_1_energy': None,
+    'ipr': None,
+    'electronic_coupling': None,
+    'reorganization_energy': None,
+    'convergence': False,
+    'n_atoms': 0
+}
+
+# 掺杂元素的价电子数（对应 DZVP-MOLOPT-PBE-GTH-q{n} 基组/赝势）
+_DOPANT_VALENCE = {'B': 3, 'N': 5, 'P': 5}
+
+
+@functools.lru_cache(maxsize=None)
+def _multi_c60_coords(num_c60_molecules: int) -> str:
+    """多C60坐标块与应变/掺杂无关，每个分子数只格式化一次"""
+    return format_multi_c60_coordinates_for_cp2k(num_c60_molecules)
+
+
+@functools.lru_cache(maxsize=None)
+def _multi_c60_coord_lines(num_c60_molecules: int) -> Tuple[str, ...]:
+    """按行拆分的多C60坐标块（掺杂输入在其副本上替换原子，不必每次重新拆分）"""
+    return tuple(_multi_c60_coords(num_c60_molecules).split('\n'))
+
+
+@functools.lru_cache(maxsize=None)
+def _multi_c60_carbon_indices(num_c60_molecules: int) -> Tuple[int, ...]:
+    """多C60坐标块中碳原子行的行号（替代性掺杂的候选位点）"""
+    coords_lines = _multi_c60_coord_lines(num_c60_molecules)
+    return tuple(i for i, line in enumerate(coords_lines) if line.lstrip().startswith('C '))
+
+
+@functools.lru_cache(maxsize=None)
+def _supercell_dimensions(num_c60_molecules: int) -> Tuple[float, float, float]:
+    """未加应变的超胞晶格参数（只与分子数有关）"""
+    return get_supercell_dimensions(num_c60_molecules)
+
+
+@functools.lru_cache(maxsize=None)
+def _strained_cell(strain: float, num_c60_molecules: int) -> Tuple[float, float, float]:
+    """根据应变计算晶格参数 - 使用多分子超胞（面内a/b按应变缩放，c为真空层不变）"""
+    lattice_a, lattice_b, lattice_c = _supercell_dimensions(num_c60_molecules)
+    strain_factor = 1 + strain/100
+    return lattice_a * strain_factor, lattice_b * strain_factor, lattice_c
+
+
+# CP2K输入模板（模块加载时构造一次，渲染时用 str.format_map 填充）
+_PRISTINE_INPUT_TEMPLATE = """&GLOBAL
   PROJECT C60_strain_{strain:+.1f}_pristine_synergy
   RUN_TYPE ENERGY
   PRINT_LEVEL MEDIUM
@@ -112,8 +410,8 @@ class SynergyExperimentRunner:
     &END CELL
     
     &COORD
-      # {self.num_c60_molecules}个C60分子坐标 (多分子体系用于协同效应研究)
-{format_multi_c60_coordinates_for_cp2k(self.num_c60_molecules)}
+      # {num_c60_molecules}个C60分子坐标 (多分子体系用于协同效应研究)
+{coords}
     &END COORD
     
     &KIND C
@@ -123,28 +421,8 @@ class SynergyExperimentRunner:
   &END SUBSYS
 &END FORCE_EVAL
 """
-        
-        with open(input_file, 'w') as f:
-            f.write(input_content)
-    
-    def _create_doped_input(self, input_file: Path, strain: float, dopant: str):
-        """创建掺杂的协同效应计算输入文件 - 使用替代性掺杂"""
-        import random
-        
-        # 根据应变计算晶格参数 - 使用多分子超胞
-        lattice_a, lattice_b, lattice_c = get_supercell_dimensions(self.num_c60_molecules)
-        lattice_a *= (1 + strain/100)
-        lattice_b *= (1 + strain/100)
-        
-        # 计算每个C60的掺杂原子数
-        total_atoms = 60 * self.num_c60_molecules
-        n_dopant = max(1, int(total_atoms * self.doping_concentration))
-        
-        # 掺杂元素的价电子数
-        dopant_q_map = {'B': 3, 'N': 5, 'P': 5}
-        dopant_q = dopant_q_map.get(dopant, 4)
-        
-        input_content = f"""&GLOBAL
+
+_DOPED_INPUT_TEMPLATE = """&GLOBAL
   PROJECT C60_strain_{strain:+.1f}_{dopant}_doped_synergy
   RUN_TYPE ENERGY
   PRINT_LEVEL MEDIUM
@@ -189,27 +467,7 @@ class SynergyExperimentRunner:
     &END CELL
     
     &COORD
-"""
-        # 获取多C60坐标并进行替代性掺杂
-        c60_coords_str = format_multi_c60_coordinates_for_cp2k(self.num_c60_molecules)
-        coords_lines = c60_coords_str.split('\n')
-        
-        # 只选择碳原子行进行替换
-        c_indices = [i for i, line in enumerate(coords_lines) if line.strip().startswith('C ')]
-        
-        # 随机选择要替换的碳原子
-        random.seed(42 + hash(f"{dopant}_{strain}_synergy"))
-        replace_indices = sorted(random.sample(c_indices, min(n_dopant, len(c_indices))))
-        
-        # 执行替换
-        for idx in replace_indices:
-            coords_lines[idx] = coords_lines[idx].replace('C ', f'{dopant} ', 1)
-        
-        c60_coords_str = '\n'.join(coords_lines)
-        logger.info(f"  替代性掺杂: 替换了 {len(replace_indices)} 个碳原子为 {dopant}")
-        
-        input_content += c60_coords_str
-        input_content += f"""
+{coords}
     &END COORD
     
     &KIND C
@@ -224,88 +482,555 @@ class SynergyExperimentRunner:
   &END SUBSYS
 &END FORCE_EVAL
 """
+
+
+@functools.lru_cache(maxsize=None)
+def _render_pristine_input(strain: float, num_c60_molecules: int) -> str:
+    """渲染未掺杂的协同效应计算输入（相同参数直接复用缓存的文本）"""
+    lattice_a, lattice_b, lattice_c = _strained_cell(strain, num_c60_molecules)
+    
+    return _PRISTINE_INPUT_TEMPLATE.format_map({
+        'strain': strain, 'lattice_a': lattice_a, 'lattice_b': lattice_b,
+        'num_c60_molecules': num_c60_molecules, 'coords': _multi_c60_coords(num_c60_molecules),
+    })
+
+
+@functools.lru_cache(maxsize=None)
+def _doped_coords(dopant: str, num_c60_molecules: int, doping_concentration: float) -> Tuple[str, int]:
+    """
+    替代性掺杂后的多C60坐标块，返回 (坐标文本, 替换的碳原子数)
+    
+    掺杂位点只由掺杂元素和浓度决定（与实验2一致），各应变下使用同一构型，
+    使协同效应的比较不混入掺杂位点差异；同一掺杂的所有应变共用缓存结果
+    """
+    # 计算每个C60的掺杂原子数
+    total_atoms = 60 * num_c60_molecules
+    n_dopant = max(1, int(total_atoms * doping_concentration))
+    
+    # 获取多C60坐标并进行替代性掺杂（只替换碳原子行）
+    coords_lines = list(_multi_c60_coord_lines(num_c60_molecules))
+    c_indices = _multi_c60_carbon_indices(num_c60_molecules)
+    
+    # 随机选择要替换的碳原子
+    # (独立的随机数生成器，不改动也不依赖全局random状态，进程池/线程中并发调用也安全；
+    #  种子取自crc32而非hash()：str的hash按进程随机加盐，跨进程/重跑时构型与结果缓存键都会变化)
+    rng = Random(42 + zlib.crc32(f"{dopant}_{doping_concentration}_synergy".encode()))
+    replace_indices = sorted(rng.sample(c_indices, min(n_dopant, len(c_indices))))
+    
+    # 执行替换
+    for idx in replace_indices:
+        coords_lines[idx] = coords_lines[idx].replace('C ', f'{dopant} ', 1)
+    
+    return '\n'.join(coords_lines), len(replace_indices)
+
+
+@functools.lru_cache(maxsize=None)
+def _render_doped_input(strain: float, dopant: str, num_c60_molecules: int,
+                        doping_concentration: float) -> Tuple[str, int]:
+    """渲染掺杂的协同效应计算输入，返回 (输入文本, 替换的碳原子数)"""
+    lattice_a, lattice_b, lattice_c = _strained_cell(strain, num_c60_molecules)
+    coords, n_replaced = _doped_coords(dopant, num_c60_molecules, doping_concentration)
+    
+    input_content = _DOPED_INPUT_TEMPLATE.format_map({
+        'strain': strain, 'dopant': dopant, 'dopant_q': _DOPANT_VALENCE.get(dopant, 4),
+        'lattice_a': lattice_a, 'lattice_b': lattice_b, 'lattice_c': lattice_c,
+        'coords': coords,
+    })
+    
+    return input_content, n_replaced
+
+
+def _write_input_file(task: Tuple[Path, float, str], num_c60_molecules: int,
+                      doping_concentration: float) -> Tuple[float, str, int]:
+    """渲染并写出单个输入文件（可在进程池中调用），返回 (应变, 掺杂, 替换的碳原子数)"""
+    input_file, strain, dopant = task
+    if dopant == 'pristine':
+        input_file.write_text(_render_pristine_input(strain, num_c60_molecules))
+        return strain, dopant, 0
+    
+    input_content, n_replaced = _render_doped_input(strain, dopant, num_c60_molecules, doping_concentration)
+    input_file.write_text(input_content)
+    return strain, dopant, n_replaced
+
+
+# 掺杂效应系数表（B/N/P替代性掺杂）: 行按 _DOPANT_IDX 索引，列为 (J, IPR, λ)；未知掺杂映射到最后一行（不调整）
+_DOPANT_IDX = {'pristine': 0, 'B': 1, 'N': 2, 'P': 3}
+_DOPANT_FACTOR_TABLE = np.array([
+    [1.0, 1.0, 1.0],     # pristine
+    [1.35, 0.70, 0.88],  # B掺杂: J增强35% (论文: p型掺杂增强耦合), IPR降低30% (更离域), λ降低12%
+    [1.25, 0.75, 0.90],  # N掺杂: J增强25%, IPR降低25%, λ降低10%
+    [1.15, 0.85, 0.95],  # P掺杂: J增强15%, IPR降低15%, λ降低5%
+    [1.0, 1.0, 1.0],     # 未知掺杂
+])
+
+# 效应序列中 IPR/J/λ 变化幅度的键（孤立效应、组合效应共用）
+_EFFECT_CHANGE_KEYS = ('ipr_change', 'coupling_change', 'reorg_change')
+
+# 调整后参数的合理范围: J 50-200 meV, IPR 15-60, λ 100-200 meV
+_PARAM_BOUNDS = {
+    'electronic_coupling': (50.0, 200.0),
+    'ipr': (15.0, 60.0),
+    'reorganization_energy': (100.0, 200.0),
+}
+
+
+def _clip3(x: float, lo: float, hi: float) -> float:
+    """标量限幅（单个条件表达式，免去 min/max 两次函数调用和 np.clip 的数组往返）"""
+    return lo if x < lo else hi if x > hi else x
+
+
+def _synergy_factors(strains: np.ndarray, dopants: List[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """按 (应变 × 掺杂) 广播计算 J/IPR/λ 调整系数，返回三个 (n_strain, n_dopant) 数组"""
+    S = np.asarray(strains, dtype=float)[:, None]
+    idx = np.array([_DOPANT_IDX.get(d, len(_DOPANT_IDX)) for d in dopants], dtype=np.intp)
+    D = _DOPANT_FACTOR_TABLE[idx].T[:, None, :]
+    
+    # 应变效应系数（论文：拉伸应变增强J，压缩应变降低J）
+    # 3%应变是最优点
+    strain_J_factor = 1.0 + 0.03 * S  # ~10% per 3% strain
+    strain_ipr_factor = 1.0 - 0.02 * S  # IPR随拉伸降低（离域增加）
+    strain_lambda_factor = 1.0 - 0.01 * np.abs(S)  # λ随应变降低
+    
+    # 协同效应：应变+掺杂的组合效应超过各自效应之和
+    # 论文核心发现：协同因子 > 1 (15%额外协同增强)
+    doped = np.array([d != 'pristine' for d in dopants])[None, :]
+    synergy_boost = np.where(doped & (np.abs(S) > 0.5), 1.15, 1.0)
+    
+    return (strain_J_factor * D[0] * synergy_boost,
+            strain_ipr_factor * D[1],
+            strain_lambda_factor * D[2])
+
+
+def _adjust_grid(strains: np.ndarray, dopants: List[str], J_base=75.0, ipr_base=47.5,
+                 lambda_base=180.0) -> Dict[str, np.ndarray]:
+    """
+    一次性计算整张 (应变 × 掺杂) 网格上调整并限幅后的 J/IPR/λ
+    
+    基础值可以是标量或可广播到 (n_strain, n_dopant) 的数组，用于掺杂浓度等更细的参数扫描
+    """
+    J_f, ipr_f, lambda_f = _synergy_factors(strains, dopants)
+    adjusted = {
+        'electronic_coupling': np.asarray(J_base) * J_f,
+        'ipr': np.asarray(ipr_base) * ipr_f,
+        'reorganization_energy': np.asarray(lambda_base) * lambda_f,
+    }
+    return {name: np.clip(values, *_PARAM_BOUNDS[name]) for name, values in adjusted.items()}
+
+
+class SynergyExperimentRunner:
+    """协同效应定量验证实验运行器"""
+    
+    def __init__(self, project_root: str = ".", scheduler: str = "local"):
+        self.project_root = Path(project_root).resolve()
+        self.experiment_dir = self.project_root / "experiments" / "exp_5_synergy"
+        self.hpc_dir = self.project_root / "hpc_calculations"
         
-        with open(input_file, 'w') as f:
-            f.write(input_content)
+        # 计算后端: 'local' 本机mpirun；'slurm'/'sge'/'pbs' 通过ExPyRe提交队列作业；
+        # 'slurm-array' 把全部组合写成一个SLURM作业数组，一次sbatch提交
+        self.scheduler = scheduler
+        
+        # 多C60分子体系配置 - 用于研究分子间协同效应
+        self.num_c60_molecules = 4  # 使用4个C60分子研究协同效应
+        
+        # DFT结果JSON是否压缩数值精度（6位小数/float32），设为False可恢复完整精度
+        self.compact_numeric = True
+        
+        # 最近一次 run_dft_calculations 中成功的计算数，汇总时无需再遍历结果
+        self._success_count = 0
+        
+        # 理论预测值 - 严格按照论文要求
+        self.theoretical_predictions = {
+            'delocalization_factor': 1.8,  # f_deloc
+            'coupling_enhancement_factor': 1.8,  # f_coupling
+            'reorganization_factor': 1.5,  # f_reorg
+            'total_enhancement_factor': 8.75,  # f_total
+            'synergistic_threshold': 3.0,  # 论文要求: >300%迁移率增强
+            'tolerance_factor': 0.2  # ±20%
+        }
+        
+        # 测试配置 - 按论文要求使用B/N/P替代性掺杂
+        self.strain_values = [-5.0, -2.5, 0.0, 2.5, 3.0, 5.0]  # % (添加3%最优应变点)
+        self.doping_types = ['pristine', 'B', 'N', 'P']  # 论文要求: B/N/P替代性掺杂
+        self.doping_concentrations = [0.025, 0.05, 0.075]  # 论文要求: 2.5%, 5%, 7.5%
+        self.doping_concentration = 0.05  # 默认5%浓度 (论文最优配置)
+        
+        # numba可用时预先编译分析内核
+        if HAS_NUMBA:
+            _warm_up_kernels()
+        
+        # 创建必要的目录
+        self.experiment_dir.mkdir(parents=True, exist_ok=True)
+        (self.experiment_dir / "outputs").mkdir(exist_ok=True)
+        (self.experiment_dir / "results").mkdir(exist_ok=True)
+        (self.experiment_dir / "figures").mkdir(exist_ok=True)
     
-    def run_dft_calculations(self):
-        """运行DFT计算 - 必须使用真实DFT，无模拟fallback"""
+    def create_dft_input_files(self):
+        """创建DFT输入文件"""
+        logger.info("创建DFT输入文件...")
+        
+        outputs_dir = self.experiment_dir / "outputs"
+        outputs_dir.mkdir(parents=True, exist_ok=True)
+        
+        tasks = [(self._calculation_files(strain, dopant)[0], strain, dopant)
+                 for strain, dopant in itertools.product(self.strain_values, self.doping_types)]
+        write_one = functools.partial(_write_input_file,
+                                      num_c60_molecules=self.num_c60_molecules,
+                                      doping_concentration=self.doping_concentration)
+        
+        # 大规模扫描时用进程池并行渲染/写出输入文件；单核时直接串行，省去进程启动开销
+        n_workers = min(_available_cpus(), len(tasks))
+        if n_workers > 1:
+            # 按掺杂元素分组并成块分发：掺杂坐标块在每个工作进程内各自缓存，
+            # 同一掺杂的各应变点落在同一进程时只需生成一次
+            by_dopant = sorted(tasks, key=lambda task: task[2])
+            chunksize = -(-len(tasks) // n_workers)
+            with multiprocessing.Pool(n_workers) as pool:
+                written = list(pool.imap_unordered(write_one, by_dopant, chunksize=chunksize))
+        else:
+            written = [write_one(task) for task in tasks]
+        
+        for strain, dopant, n_replaced in sorted(written, key=lambda w: (w[0], w[1])):
+            if dopant != 'pristine':
+                logger.info(f"  替代性掺杂: strain = {strain:+.1f}%, 替换了 {n_replaced} 个碳原子为 {dopant}")
+        for strain in self.strain_values:
+            logger.info(f"创建输入文件: strain = {strain:+.1f}%, {len(self.doping_types)} 个 ({', '.join(self.doping_types)})")
+        
+        logger.info(f"共创建 {len(written)} 个输入文件于 {outputs_dir}")
+    
+    def run_dft_calculations(self, force: bool = False):
+        """运行DFT计算 - 必须使用真实DFT，无模拟fallback（force=True 时忽略结果缓存，全部重新计算）"""
         logger.info("开始运行真实DFT计算...")
         
         # 查找CP2K可执行文件
-        cp2k_exe = self._find_cp2k_executable()
+        cp2k_exe = self.cp2k_exe
         if not cp2k_exe:
             raise RuntimeError("未找到CP2K可执行文件！请确保CP2K已正确安装。")
         
-        results = {}
-        
-        for strain in self.strain_values:
-            for dopant in self.doping_types:
-                if dopant == 'pristine':
-                    input_file = self.experiment_dir / "outputs" / f"C60_strain_{strain:+.1f}_pristine_synergy.inp"
-                    output_file = self.experiment_dir / "outputs" / f"C60_strain_{strain:+.1f}_pristine_synergy.out"
+        nprocs = int(os.environ.get('NPROCS', '32'))
+        tasks = [(strain, dopant) for strain in self.strain_values for dopant in self.doping_types]
+        
+        # 已收敛且输入/CP2K未变的计算直接复用缓存结果（断点续算、增量扫描）
+        cache = self._load_results_cache()
+        cached_results = {}
+        pending = []
+        for strain, dopant in tasks:
+            cached = None if force else self._cached_result(cache, cp2k_exe, strain, dopant)
+            if cached is not None:
+                cached_results[f"strain_{strain}_{dopant}"] = cached
+            else:
+                pending.append((strain, dopant))
+        if cached_results:
+            logger.info(f"复用 {len(cached_results)} 个已收敛的缓存结果，剩余 {len(pending)} 个计算")
+        
+        def checkpoint(strain: float, dopant: str, result: Dict):
+            """每收集到一个成功结果就写一次检查点，驱动进程中途退出后可从此处续算"""
+            if self._update_results_cache(cache, cp2k_exe, strain, dopant, result):
+                self._save_results_cache(cache)
+        
+        new_results = {}
+        if pending:
+            if self.scheduler not in ('local', 'slurm-array') and not HAS_EXPYRE:
+                logger.warning(f"未安装ExPyRe，无法提交到 {self.scheduler} 队列，改为本地运行")
+            
+            if self.scheduler == 'slurm-array' or (self.scheduler != 'local' and HAS_EXPYRE):
+                if self.scheduler == 'slurm-array':
+                    new_results = self._run_dft_calculations_array(cp2k_exe, pending, nprocs, checkpoint)
                 else:
-                    input_file = self.experiment_dir / "outputs" / f"C60_strain_{strain:+.1f}_{dopant}_doped_synergy.inp"
-                    output_file = self.experiment_dir / "outputs" / f"C60_strain_{strain:+.1f}_{dopant}_doped_synergy.out"
-                
-                logger.info(f"运行计算: strain = {strain}%, dopant = {dopant}")
-                
-                # 运行CP2K计算 (MPI并行, 32 CPU)
-                nprocs = int(os.environ.get('NPROCS', '32'))
-                cmd = ['mpirun', '-np', str(nprocs), str(cp2k_exe), '-i', str(input_file)]
-                logger.info(f"   命令: mpirun -np {nprocs} {cp2k_exe}")
+                    new_results = self._run_dft_calculations_queued(cp2k_exe, pending, nprocs, checkpoint)
+            else:
+                # 各(应变, 掺杂)计算相互独立，用线程池并发提交（subprocess等待时释放GIL）
+                # 每个作业本身占用NPROCS个MPI进程，默认并发数按CPU总数折算，避免超订
+                max_jobs = int(os.environ.get('MAX_PARALLEL_JOBS', max(1, _available_cpus() // nprocs)))
                 
-                try:
-                    start_time = time.time()
-                    with open(output_file, 'w') as f:
-                        result = subprocess.run(cmd, stdout=f, stderr=subprocess.PIPE, 
-                                              timeout=1800, cwd=self.experiment_dir / "outputs")
-                    
-                    calculation_time = time.time() - start_time
-                    
-                    if result.returncode == 0:
-                        # 解析输出
-                        output_info = self._parse_dft_output(output_file)
-                        
-                        # 根据应变和掺杂调整关键参数（基于论文预测）
-                        output_info = self._adjust_parameters_for_synergy(output_info, strain, dopant)
-                        
-                        output_info.update({
-                            'strain': strain,
-                            'dopant': dopant,
-                            'calculation_time': calculation_time,
-                            'status': 'success'
-                        })
-                        results[f"strain_{strain}_{dopant}"] = output_info
-                        logger.info(f"计算成功: strain = {strain}%, dopant = {dopant}, 用时: {calculation_time:.2f}s")
-                        logger.info(f"  J = {output_info['electronic_coupling']:.1f} meV, IPR = {output_info['ipr']:.1f}, λ = {output_info['reorganization_energy']:.1f} meV")
-                    else:
-                        logger.error(f"计算失败: strain = {strain}%, dopant = {dopant}, 错误: {result.stderr.decode()}")
-                        results[f"strain_{strain}_{dopant}"] = {
-                            'strain': strain,
-                            'dopant': dopant,
-                            'status': 'failed',
-                            'error': result.stderr.decode()
-                        }
-                        
-                except subprocess.TimeoutExpired:
-                    logger.error(f"计算超时: strain = {strain}%, dopant = {dopant}")
-                    results[f"strain_{strain}_{dopant}"] = {
-                        'strain': strain,
-                        'dopant': dopant,
-                        'status': 'timeout'
-                    }
-                except Exception as e:
-                    logger.error(f"计算异常: strain = {strain}%, dopant = {dopant}, 错误: {e}")
-                    results[f"strain_{strain}_{dopant}"] = {
-                        'strain': strain,
-                        'dopant': dopant,
-                        'status': 'error',
-                        'error': str(e)
-                    }
+                with ThreadPoolExecutor(max_workers=max_jobs) as executor:
+                    # 多个mpirun各自从0号核开始绑定，并发时会叠在同一批核上，因此只在单作业时绑核
+                    futures = {executor.submit(self._run_single_calculation, cp2k_exe, strain, dopant, nprocs,
+                                               max_jobs == 1): (strain, dopant)
+                               for strain, dopant in pending}
+                    for future in as_completed(futures):
+                        key, result = future.result()
+                        new_results[key] = result
+                        checkpoint(*futures[future], result)
+        
+        # 按任务顺序汇总，保持结果字典的键顺序与串行版本一致；顺带统计成功计算数
+        results = {}
+        success_count = 0
+        for strain, dopant in tasks:
+            key = f"strain_{strain}_{dopant}"
+            result = results[key] = cached_results[key] if key in cached_results else new_results[key]
+            if result['status'] == 'success':
+                success_count += 1
+        self._success_count = success_count
+        
+        return results
+    
+    @property
+    def _results_cache_file(self) -> Path:
+        return self.experiment_dir / "outputs" / "results_cache.json"
+    
+    def _load_results_cache(self) -> Dict:
+        """读取结果缓存（不存在或损坏时返回空缓存）"""
+        try:
+            return _load_if_exists(self._results_cache_file) or {}
+        except (OSError, ValueError):
+            return {}
+    
+    def _save_results_cache(self, cache: Dict):
+        """原子地写出结果缓存，避免中断时留下半个JSON文件"""
+        tmp_file = self._results_cache_file.with_suffix('.json.tmp')
+        _dump_json(cache, tmp_file)
+        os.replace(tmp_file, self._results_cache_file)
+    
+    def _cache_tag(self, cp2k_exe: Path, strain: float, dopant: str) -> str:
+        """缓存键：输入文件内容 + CP2K可执行文件路径及其构建标识，任一变化都会使缓存失效"""
+        input_file, _ = self._calculation_files(strain, dopant)
+        digest = hashlib.sha1(input_file.read_bytes())
+        digest.update(str(cp2k_exe).encode())
+        digest.update(_cp2k_build_id(str(cp2k_exe)).encode())
+        return digest.hexdigest()
+    
+    def _cached_result(self, cache: Dict, cp2k_exe: Path, strain: float, dopant: str):
+        """返回可复用的缓存结果；输出文件缺失、未收敛或输入已改变时返回None"""
+        entry = cache.get(f"strain_{strain}_{dopant}")
+        if not entry:
+            return None
+        _, output_file = self._calculation_files(strain, dopant)
+        try:
+            if not output_file.exists() or entry['tag'] != self._cache_tag(cp2k_exe, strain, dopant):
+                return None
+        except OSError:
+            return None
+        result = entry['result']
+        if result.get('status') != 'success' or not result.get('convergence'):
+            return None
+        return dict(result, cached=True)
+    
+    def _update_results_cache(self, cache: Dict, cp2k_exe: Path, strain: float, dopant: str, result: Dict) -> bool:
+        """把收敛的成功结果写入缓存，返回是否有更新"""
+        if result.get('status') != 'success' or not result.get('convergence'):
+            return False
+        cache[f"strain_{strain}_{dopant}"] = {
+            'tag': self._cache_tag(cp2k_exe, strain, dopant),
+            'result': {k: v for k, v in result.items() if k != 'cached'}
+        }
+        return True
+    
+    def _run_dft_calculations_queued(self, cp2k_exe: Path, tasks: List[Tuple[float, str]], nprocs: int,
+                                     checkpoint) -> Dict:
+        """通过ExPyRe把每个(应变, 掺杂)计算作为独立队列作业提交，全部提交后再统一收集结果"""
+        system_name = os.environ.get('EXPYRE_SYS', self.scheduler)
+        max_time = os.environ.get('SYNERGY_MAX_TIME', '2h')
+        
+        jobs = []
+        for strain, dopant in tasks:
+            input_file, output_file = self._calculation_files(strain, dopant)
+            xpr = ExPyRe(name=f"synergy_{strain:+.1f}_{dopant}",
+                         input_files=[str(input_file)],
+                         function=_run_cp2k_remote,
+                         kwargs={'cp2k_exe': str(cp2k_exe), 'input_name': input_file.name,
+                                 'nprocs': nprocs, 'timeout': 1800})
+            xpr.start(resources={'num_nodes': 1, 'max_time': max_time}, system_name=system_name)
+            logger.info(f"已提交队列作业: strain = {strain}%, dopant = {dopant} ({system_name})")
+            jobs.append((strain, dopant, output_file, xpr, time.monotonic()))
+        
+        results = {}
+        for strain, dopant, output_file, xpr, submit_time in jobs:
+            key = f"strain_{strain}_{dopant}"
+            try:
+                (returncode, stdout, stderr), _, _ = xpr.get_results()
+                xpr.mark_processed()
+                output_file.write_text(stdout)
+                results[key] = self._collect_result(strain, dopant, output_file, returncode, stderr,
+                                                    time.monotonic() - submit_time)
+                checkpoint(strain, dopant, results[key])
+            except Exception as e:
+                logger.error(f"队列作业异常: strain = {strain}%, dopant = {dopant}, 错误: {e}")
+                results[key] = self._status_result(strain, dopant, 'error', str(e))
         
         return results
     
+    def _run_dft_calculations_array(self, cp2k_exe: Path, tasks: List[Tuple[float, str]], nprocs: int,
+                                    checkpoint) -> Dict:
+        """把全部待算组合作为一个SLURM作业数组提交（sbatch --wait 阻塞到所有子作业结束），再统一收集结果"""
+        script_file = self._write_array_script(cp2k_exe, tasks, nprocs)
+        logger.info(f"提交SLURM作业数组: {len(tasks)} 个子作业 ({script_file})")
+        
+        start_time = time.monotonic()
+        try:
+            # 任一子作业失败时sbatch --wait 返回非零，这里不据此判断，逐个读取子作业的返回码
+            subprocess.run(['sbatch', '--wait', str(script_file)], capture_output=True,
+                           cwd=self.experiment_dir / "outputs")
+        except Exception as e:
+            logger.error(f"作业数组提交失败: {e}")
+            return {f"strain_{strain}_{dopant}": self._status_result(strain, dopant, 'error', str(e))
+                    for strain, dopant in tasks}
+        calculation_time = time.monotonic() - start_time
+        
+        results = {}
+        for strain, dopant in tasks:
+            _, output_file = self._calculation_files(strain, dopant)
+            try:
+                returncode = int(output_file.with_suffix('.rc').read_text())
+            except (OSError, ValueError):
+                returncode = -1  # 子作业未运行或被调度器终止
+            stderr = ''
+            if returncode != 0:
+                err_file = output_file.with_suffix('.err')
+                stderr = _tail_err(err_file.read_bytes()) if err_file.exists() else '子作业未正常结束'
+            result = results[f"strain_{strain}_{dopant}"] = self._collect_result(
+                strain, dopant, output_file, returncode, stderr, calculation_time)
+            checkpoint(strain, dopant, result)
+        return results
+    
+    def _write_array_script(self, cp2k_exe: Path, tasks: List[Tuple[float, str]], nprocs: int) -> Path:
+        """生成SLURM作业数组脚本：第i个子作业运行第i个输入文件，并记录其返回码"""
+        input_names = []
+        for strain, dopant in tasks:
+            input_file, output_file = self._calculation_files(strain, dopant)
+            # 清除上一次运行遗留的返回码，避免把旧结果当成本次结果
+            output_file.with_suffix('.rc').unlink(missing_ok=True)
+            input_names.append(input_file.name)
+        
+        script = f"""#!/bin/bash
+#SBATCH --job-name=synergy_array
+#SBATCH --array=0-{len(tasks) - 1}
+#SBATCH --nodes=1
+#SBATCH --ntasks-per-node={nprocs}
+#SBATCH --time={os.environ.get('SYNERGY_ARRAY_TIME', '02:00:00')}
+#SBATCH --output=synergy_array-%A_%a.log
+
+# 设置环境
+export OMP_NUM_THREADS=1
+
+# 进入工作目录
+cd {self.experiment_dir / "outputs"}
+
+INPUTS=({' '.join(input_names)})
+INPUT=${{INPUTS[$SLURM_ARRAY_TASK_ID]}}
+
+srun -n {nprocs} {cp2k_exe} -i "$INPUT" > "${{INPUT%.inp}}.out" 2> "${{INPUT%.inp}}.err"
+echo $? > "${{INPUT%.inp}}.rc"
+"""
+        script_file = self.hpc_dir / "batch_scripts" / "synergy_array.sbatch"
+        script_file.parent.mkdir(parents=True, exist_ok=True)
+        script_file.write_text(script)
+        return script_file
+    
+    def _calculation_files(self, strain: float, dopant: str) -> Tuple[Path, Path]:
+        """返回(应变, 掺杂)组合对应的输入/输出文件路径"""
+        if dopant == 'pristine':
+            stem = f"C60_strain_{strain:+.1f}_pristine_synergy"
+        else:
+            stem = f"C60_strain_{strain:+.1f}_{dopant}_doped_synergy"
+        outputs_dir = self.experiment_dir / "outputs"
+        return outputs_dir / f"{stem}.inp", outputs_dir / f"{stem}.out"
+    
+    def _run_single_calculation(self, cp2k_exe: Path, strain: float, dopant: str, nprocs: int,
+                                bind_cores: bool = True) -> Tuple[str, Dict]:
+        """运行单个(应变, 掺杂)组合的CP2K计算，返回 (结果键, 结果字典)"""
+        input_file, output_file = self._calculation_files(strain, dopant)
+        
+        key = f"strain_{strain}_{dopant}"
+        logger.info(f"运行计算: strain = {strain}%, dopant = {dopant}")
+        
+        # 运行CP2K计算 (MPI或MPI+OpenMP混合并行, 共nprocs个核)
+        ntasks, omp_threads = self._pick_parallel_config(cp2k_exe, dopant, nprocs)
+        cmd, bound = self._launch_command(cp2k_exe, input_file, ntasks, omp_threads, bind_cores)
+        logger.info(f"   命令: {' '.join(cmd[:-3])} {cp2k_exe} (OMP_NUM_THREADS={omp_threads})")
+        env = dict(os.environ, OMP_NUM_THREADS=str(omp_threads))
+        if bound:
+            # 进程已绑定到各自的核上时，线程也固定在本进程的核内，避免核间迁移造成的远端内存访问
+            env.update(OMP_PROC_BIND='close', OMP_PLACES='cores')
+        
+        try:
+            start_time = time.monotonic()
+            with open(output_file, 'w') as f:
+                result = subprocess.run(cmd, stdout=f, stderr=subprocess.PIPE, env=env,
+                                      timeout=1800, cwd=self.experiment_dir / "outputs")
+            
+            calculation_time = time.monotonic() - start_time
+            # 成功时不解码stderr；失败时只保留末尾部分用于日志和结果记录
+            stderr = _tail_err(result.stderr) if result.returncode != 0 else ''
+            return key, self._collect_result(strain, dopant, output_file, result.returncode,
+                                             stderr, calculation_time)
+                
+        except subprocess.TimeoutExpired:
+            logger.error(f"计算超时: strain = {strain}%, dopant = {dopant}")
+            return key, self._status_result(strain, dopant, 'timeout')
+        except Exception as e:
+            logger.error(f"计算异常: strain = {strain}%, dopant = {dopant}, 错误: {e}")
+            return key, self._status_result(strain, dopant, 'error', str(e))
+    
+    @staticmethod
+    def _pick_parallel_config(cp2k_exe: Path, dopant: str, nprocs: int) -> Tuple[int, int]:
+        """
+        为单个计算选择 (MPI进程数, 每进程OpenMP线程数)，总核数保持为nprocs
+        
+        掺杂体系使用OT求解，更大的本征问题在MPI+OpenMP混合并行下吞吐更高；
+        未掺杂体系保持纯MPI。只有psmp版本的CP2K支持OpenMP，其余版本始终为纯MPI。
+        """
+        threads = int(os.environ.get('SYNERGY_OMP_THREADS', '4'))
+        if dopant == 'pristine' or 'psmp' not in Path(cp2k_exe).name or threads <= 1 or nprocs % threads:
+            return nprocs, 1
+        return nprocs // threads, threads
+    
+    @staticmethod
+    def _launch_command(cp2k_exe: Path, input_file: Path, ntasks: int, omp_threads: int,
+                        bind_cores: bool = True) -> Tuple[List[str], bool]:
+        """
+        构造并行启动命令，返回 (命令, 是否已绑核)
+        
+        SLURM作业内使用srun：--exclusive 让并发的作业步各自分到互不重叠的核，因此总是绑核。
+        否则使用mpirun：各mpirun互不知晓彼此的绑定，只在bind_cores为真（单作业）时绑核，
+        且绑核参数按MPI实现选择，无法识别实现时不加绑核参数。
+        """
+        if 'SLURM_JOB_ID' in os.environ:
+            launcher = ['srun', '--exclusive', f'--ntasks={ntasks}', f'--cpus-per-task={omp_threads}',
+                        '--cpu-bind=cores', '--hint=nomultithread']
+            return launcher + [str(cp2k_exe), '-i', str(input_file)], True
+        
+        launcher = ['mpirun', '-np', str(ntasks)]
+        flavor = _mpi_flavor() if bind_cores else ''
+        if flavor == 'openmpi':
+            launcher += ['--bind-to', 'core', '--map-by', f'socket:PE={omp_threads}']
+        elif flavor == 'mpich':
+            launcher += ['-bind-to', f'core:{omp_threads}']
+        elif flavor == 'intel':
+            launcher += ['-genv', 'I_MPI_PIN_DOMAIN', 'omp' if omp_threads > 1 else 'core']
+        return launcher + [str(cp2k_exe), '-i', str(input_file)], bool(flavor)
+    
+    def _collect_result(self, strain: float, dopant: str, output_file: Path, returncode: int,
+                        stderr: str, calculation_time: float) -> Dict:
+        """根据CP2K返回码整理单个计算的结果（本地与队列作业共用）"""
+        if returncode == 0:
+            # 解析输出；之后不会再读取该文件，释放其占用的页缓存（CP2K输出可达GB级）
+            output_info = self._parse_dft_output(output_file)
+            _drop_page_cache(output_file)
+            
+            # 根据应变和掺杂调整关键参数（基于论文预测）
+            output_info = self._adjust_parameters_for_synergy(output_info, strain, dopant)
+            
+            output_info.update({
+                'strain': strain,
+                'dopant': dopant,
+                'calculation_time': calculation_time,
+                'status': 'success'
+            })
+            logger.info(f"计算成功: strain = {strain}%, dopant = {dopant}, 用时: {calculation_time:.2f}s")
+            logger.info(f"  J = {output_info['electronic_coupling']:.1f} meV, IPR = {output_info['ipr']:.1f}, λ = {output_info['reorganization_energy']:.1f} meV")
+            return output_info
+        
+        logger.error(f"计算失败: strain = {strain}%, dopant = {dopant}, 错误: {stderr}")
+        return self._status_result(strain, dopant, 'failed', stderr)
+    
+    @staticmethod
+    def _status_result(strain: float, dopant: str, status: str, error: str = None) -> Dict:
+        """未成功计算（failed/timeout/error）的统一结果记录"""
+        result = {'strain': strain, 'dopant': dopant, 'status': status}
+        if error is not None:
+            result['error'] = error
+        return result
+    
     def _adjust_parameters_for_synergy(self, output_info: Dict, strain: float, dopant: str) -> Dict:
         """
         根据应变和掺杂调整关键参数（基于论文预测和DFT能量）
@@ -320,62 +1045,37 @@ class SynergyExperimentRunner:
         ipr_base = output_info.get('ipr', 47.5)
         lambda_base = output_info.get('reorganization_energy', 180.0)
         
-        # 应变效应系数（论文：拉伸应变增强J，压缩应变降低J）
-        # 3%应变是最优点
-        strain_J_factor = 1.0 + 0.03 * strain  # ~10% per 3% strain
-        strain_ipr_factor = 1.0 - 0.02 * strain  # IPR随拉伸降低（离域增加）
-        strain_lambda_factor = 1.0 - 0.01 * abs(strain)  # λ随应变降低
-        
-        # 掺杂效应系数（B/N/P替代性掺杂）
-        dopant_J_factors = {
-            'pristine': 1.0,
-            'B': 1.35,   # B掺杂: J增强35% (论文: p型掺杂增强耦合)
-            'N': 1.25,   # N掺杂: J增强25%
-            'P': 1.15    # P掺杂: J增强15%
-        }
-        dopant_ipr_factors = {
-            'pristine': 1.0,
-            'B': 0.70,   # B掺杂: IPR降低30% (更离域)
-            'N': 0.75,   # N掺杂: IPR降低25%
-            'P': 0.85    # P掺杂: IPR降低15%
-        }
-        dopant_lambda_factors = {
-            'pristine': 1.0,
-            'B': 0.88,   # B掺杂: λ降低12%
-            'N': 0.90,   # N掺杂: λ降低10%
-            'P': 0.95    # P掺杂: λ降低5%
-        }
-        
-        dopant_J_factor = dopant_J_factors.get(dopant, 1.0)
-        dopant_ipr_factor = dopant_ipr_factors.get(dopant, 1.0)
-        dopant_lambda_factor = dopant_lambda_factors.get(dopant, 1.0)
-        
-        # 协同效应：应变+掺杂的组合效应超过各自效应之和
-        # 论文核心发现：协同因子 > 1
-        if dopant != 'pristine' and abs(strain) > 0.5:
-            synergy_boost = 1.15  # 15%额外协同增强
-        else:
-            synergy_boost = 1.0
-        
-        # 计算最终值
-        J_final = J_base * strain_J_factor * dopant_J_factor * synergy_boost
-        ipr_final = ipr_base * strain_ipr_factor * dopant_ipr_factor
-        lambda_final = lambda_base * strain_lambda_factor * dopant_lambda_factor
-        
-        # 应用合理范围限制
-        J_final = max(50.0, min(200.0, J_final))  # 50-200 meV
-        ipr_final = max(15.0, min(60.0, ipr_final))  # 15-60
-        lambda_final = max(100.0, min(200.0, lambda_final))  # 100-200 meV
+        # 调整系数只依赖 (strain, dopant)，整张网格预先一次性广播算好
+        factors = self._synergy_factor_grid.get((strain, dopant))
+        if factors is None:
+            J_f, ipr_f, lambda_f = _synergy_factors(np.array([strain]), [dopant])
+            factors = (J_f[0, 0], ipr_f[0, 0], lambda_f[0, 0])
+        J_factor, ipr_factor, lambda_factor = factors
         
-        output_info['electronic_coupling'] = J_final
-        output_info['ipr'] = ipr_final
-        output_info['reorganization_energy'] = lambda_final
+        # 计算最终值，并应用合理范围限制（与 _adjust_grid 共用 _PARAM_BOUNDS）
+        for name, value in (('electronic_coupling', J_base * J_factor), ('ipr', ipr_base * ipr_factor),
+                            ('reorganization_energy', lambda_base * lambda_factor)):
+            output_info[name] = float(_clip3(value, *_PARAM_BOUNDS[name]))
         
         return output_info
     
-    def _find_cp2k_executable(self):
-        """查找CP2K可执行文件"""
-        import shutil
+    @functools.cached_property
+    def _synergy_factor_grid(self) -> Dict[Tuple[float, str], Tuple[float, float, float]]:
+        """全部 (strain, dopant) 组合的 (J, IPR, λ) 调整系数"""
+        J_f, ipr_f, lambda_f = _synergy_factors(np.array(self.strain_values), self.doping_types)
+        return {
+            (strain, dopant): (J_f[i, j], ipr_f[i, j], lambda_f[i, j])
+            for i, strain in enumerate(self.strain_values)
+            for j, dopant in enumerate(self.doping_types)
+        }
+    
+    @functools.cached_property
+    def cp2k_exe(self):
+        """CP2K可执行文件路径（查找一次后在运行器生命周期内复用）"""
+        # 环境变量 CP2K 指定时直接使用，跳过文件系统探测
+        env_exe = os.environ.get('CP2K')
+        if env_exe:
+            return Path(env_exe)
         
         possible_paths = [
             Path("/opt/cp2k/exe/Linux-aarch64-minimal/cp2k.psmp"),
@@ -390,71 +1090,83 @@ class SynergyExperimentRunner:
                 return path
         return None
     
+    @staticmethod
+    def _parse_mapped_scalars(mm: mmap.mmap, output_info: Dict):
+        """大文件路径：提取总能量、收敛标志和原子数（与逐行解析的"最后一次出现为准"语义一致）"""
+        total_energy = _last_line_value(mm, (b'ENERGY| Total FORCE_EVAL',), float, at_line_start=True)
+        if total_energy is not None:
+            output_info['total_energy'] = total_energy
+        if mm.find(b'SCF run converged') >= 0:
+            output_info['convergence'] = True
+        n_atoms = _last_line_value(mm, (b'Number of atoms', b'- Atoms:'), int)
+        if n_atoms is not None:
+            output_info['n_atoms'] = n_atoms
+    
     def _parse_dft_output(self, output_file: Path) -> Dict:
         """解析DFT输出文件 - 提取能量、能级和协同效应相关参数"""
-        output_info = {
-            'total_energy': None,
-            'homo_energy': None,
-            'lumo_energy': None,
-            'homo_1_energy': None,
-            'ipr': None,
-            'electronic_coupling': None,
-            'reorganization_energy': None,
-            'convergence': False,
-            'n_atoms': 0
-        }
+        output_info = dict(_OUTPUT_INFO_DEFAULTS)
         
         try:
-            with open(output_file, 'r') as f:
-                content = f.read()
-            
-            lines = content.split('\n')
             eigenvalues = []
-            mulliken_charges = []
+            mulliken_charges = array.array('d')  # 连续double缓冲区，结束后零拷贝转为numpy数组
             in_mulliken = False
             
-            for line in lines:
-                # 提取总能量
-                if 'ENERGY| Total FORCE_EVAL' in line:
-                    try:
-                        output_info['total_energy'] = float(line.split()[-1])
-                    except:
-                        pass
-                
-                # 检查收敛
-                if 'SCF run converged' in line:
-                    output_info['convergence'] = True
-                
-                # 提取原子数
-                if 'Number of atoms' in line or '- Atoms:' in line:
-                    try:
-                        output_info['n_atoms'] = int(line.split()[-1])
-                    except:
-                        pass
-                
-                # 提取MO能级用于J计算
-                if 'MO|' in line and 'eV' in line:
-                    parts = line.split()
-                    for i, p in enumerate(parts):
-                        if p == 'eV' and i > 0:
-                            try:
-                                eigenvalues.append(float(parts[i-1]))
-                            except:
-                                pass
+            # 逐行流式读取，不把多MB的CP2K输出整体读入内存
+            # (MO能级与Mulliken电荷需要扫描全文件，因此不能提前退出)
+            # 大文件改为mmap映射：标量从文件末尾向前查找（收敛标志找到即停），MO能级和Mulliken电荷由正则批量提取
+            with open(output_file, 'r') as f:
+                if os.fstat(f.fileno()).st_size > _MMAP_PARSE_THRESHOLD:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        self._parse_mapped_scalars(mm, output_info)
+                        eigenvalues, charges = _mapped_mo_and_mulliken(mm)
+                    mulliken_charges.extend(charges)
+                    lines = ()
+                else:
+                    lines = f
                 
-                # 提取Mulliken电荷用于IPR计算
-                if 'Mulliken Population Analysis' in line:
-                    in_mulliken = True
-                    continue
-                if in_mulliken and 'Total charge' in line:
-                    in_mulliken = False
-                if in_mulliken:
-                    parts = line.split()
-                    if len(parts) >= 4 and parts[0].isdigit():
+                for line in lines:
+                    # CP2K的标签位于行首，用前缀判断代替整行子串查找
+                    stripped = line.lstrip()
+                    
+                    # 提取总能量
+                    if stripped.startswith('ENERGY| Total FORCE_EVAL'):
+                        try:
+                            output_info['total_energy'] = float(line.split()[-1])
+                        except:
+                            pass
+                    
+                    # 检查收敛
+                    if 'SCF run converged' in line:
+                        output_info['convergence'] = True
+                    
+                    # 提取原子数
+                    if 'Number of atoms' in line or '- Atoms:' in line:
                         try:
-                            mulliken_charges.append(float(parts[-1]))
+                            output_info['n_atoms'] = int(line.split()[-1])
                         except:
                             pass
+                    
+                    # 提取MO能级用于J计算
+                    if stripped.startswith('MO|') and 'eV' in line:
+                        for value in _MO_EV_RE.findall(line):
+                            try:
+                                eigenvalues.append(float(value))
+                            except ValueError:
+                                pass
+                    
+                    # 提取Mulliken电荷用于IPR计算
+                    if 'Mulliken Population Analysis' in line:
+                        in_mulliken = True
+                        continue
+                    if in_mulliken and 'Total charge' in line:
+                        in_mulliken = False
+                    if in_mulliken:
+                        parts = line.split()
+                        if len(parts) >= 4 and parts[0].isdigit():
+                            try:
+                                mulliken_charges.append(float(parts[-1]))
+                            except:
+                                pass
             
             # 从特征值计算HOMO/LUMO和电子耦合J
             if eigenvalues and len(eigenvalues) >= 4:
@@ -475,12 +1187,13 @@ class SynergyExperimentRunner:
                 output_info['electronic_coupling'] = 75.0
             
             # 从Mulliken电荷计算IPR
+            # IPR = 1/Σ(c_i/Σc)² = (Σc)²/Σc²，不必构造归一化的中间数组
             if mulliken_charges:
-                charges = np.array(mulliken_charges)
-                charges = np.abs(charges - np.mean(charges))
-                if charges.sum() > 0:
-                    normalized = charges / charges.sum()
-                    output_info['ipr'] = 1.0 / np.sum(normalized**2)
+                charges = np.frombuffer(mulliken_charges, dtype=np.float64)
+                charges = np.abs(charges - charges.mean())
+                total = charges.sum()
+                if total > 0:
+                    output_info['ipr'] = float(total * total / np.dot(charges, charges))
             
             # 如果没有从DFT获取IPR，使用论文理论值
             if output_info['ipr'] is None:
@@ -500,8 +1213,8 @@ class SynergyExperimentRunner:
         
         return output_info
     
-    def analyze_results(self, dft_results: Dict):
-        """分析DFT结果"""
+    def analyze_results(self, dft_results: Dict, make_plots: bool = True):
+        """分析DFT结果（make_plots=False 时跳过全部matplotlib绘图，只计算验证指标）"""
         logger.info("分析DFT结果...")
         
         analysis_results = {
@@ -512,12 +1225,15 @@ class SynergyExperimentRunner:
             'plots': {}
         }
         
+        # 一次遍历建立按掺杂/应变分组的成功结果索引，供后续分析直接查表
+        results_index = self._index_results(dft_results)
+        
         # 分析孤立效应
-        isolated_effects = self._analyze_isolated_effects(dft_results)
+        isolated_effects = self._analyze_isolated_effects(results_index)
         analysis_results['isolated_effects'] = isolated_effects
         
         # 分析组合效应
-        combined_effects = self._analyze_combined_effects(dft_results)
+        combined_effects = self._analyze_combined_effects(results_index)
         analysis_results['combined_effects'] = combined_effects
         
         # 计算协同因子
@@ -529,120 +1245,99 @@ class SynergyExperimentRunner:
         analysis_results['validation_metrics'] = validation_metrics
         
         # 生成图表
-        plots = self._generate_plots(dft_results, analysis_results)
-        analysis_results['plots'] = plots
+        if make_plots:
+            analysis_results['plots'] = self._generate_plots(dft_results, analysis_results)
         
         return analysis_results
     
-    def _analyze_isolated_effects(self, dft_results: Dict) -> Dict:
+    def _index_results(self, dft_results: Dict) -> Dict:
+        """
+        将成功的计算结果整理为一张 (n, 3) 的 IPR/J/λ 数值表，并按掺杂类型和应变分组
+        
+        分组中只保存行号，各效应序列直接对数值表切片（只遍历一次dft_results）
+        """
+        records = [r for r in dft_results.values() if r['status'] == 'success']
+        by_dopant = defaultdict(list)
+        by_strain = defaultdict(list)
+        for row, r in enumerate(records):
+            by_dopant[r['dopant']].append(row)
+            by_strain[r['strain']].append(row)
+        values = np.array([[r['ipr'], r['electronic_coupling'], r['reorganization_energy']] for r in records],
+                          dtype=float).reshape(-1, 3)
+        return {'records': records, 'values': values, 'by_dopant': by_dopant, 'by_strain': by_strain}
+    
+    def _analyze_isolated_effects(self, results_index: Dict) -> Dict:
         """分析孤立效应"""
         isolated_effects = {}
+        records = results_index['records']
         
         # 分析应变效应（无掺杂）
-        pristine_results = [r for r in dft_results.values() if r['status'] == 'success' and r['dopant'] == 'pristine']
-        if pristine_results:
-            strains = [r['strain'] for r in pristine_results]
-            iprs = [r['ipr'] for r in pristine_results]
-            couplings = [r['electronic_coupling'] for r in pristine_results]
-            reorgs = [r['reorganization_energy'] for r in pristine_results]
-            
+        pristine_rows = results_index['by_dopant'].get('pristine')
+        if pristine_rows:
             isolated_effects['strain_only'] = {
-                'strains': strains,
-                'iprs': iprs,
-                'couplings': couplings,
-                'reorgs': reorgs,
-                'ipr_change': max(iprs) - min(iprs),
-                'coupling_change': max(couplings) - min(couplings),
-                'reorg_change': max(reorgs) - min(reorgs)
+                'strains': [records[i]['strain'] for i in pristine_rows],
+                **self._effect_series(results_index, pristine_rows)
             }
         
         # 分析掺杂效应（无应变）
-        zero_strain_results = [r for r in dft_results.values() if r['status'] == 'success' and r['strain'] == 0.0]
-        if zero_strain_results:
-            dopants = [r['dopant'] for r in zero_strain_results]
-            iprs = [r['ipr'] for r in zero_strain_results]
-            couplings = [r['electronic_coupling'] for r in zero_strain_results]
-            reorgs = [r['reorganization_energy'] for r in zero_strain_results]
-            
+        zero_strain_rows = results_index['by_strain'].get(0.0)
+        if zero_strain_rows:
             isolated_effects['doping_only'] = {
-                'dopants': dopants,
-                'iprs': iprs,
-                'couplings': couplings,
-                'reorgs': reorgs,
-                'ipr_change': max(iprs) - min(iprs),
-                'coupling_change': max(couplings) - min(couplings),
-                'reorg_change': max(reorgs) - min(reorgs)
+                'dopants': [records[i]['dopant'] for i in zero_strain_rows],
+                **self._effect_series(results_index, zero_strain_rows)
             }
         
         return isolated_effects
     
-    def _analyze_combined_effects(self, dft_results: Dict) -> Dict:
+    def _analyze_combined_effects(self, results_index: Dict) -> Dict:
         """分析组合效应"""
         combined_effects = {}
+        records = results_index['records']
         
         # 分析不同掺杂类型的组合效应 (B/N/P替代性掺杂)
         for dopant in ['B', 'N', 'P']:
-            dopant_results = [r for r in dft_results.values() if r['status'] == 'success' and r['dopant'] == dopant]
-            if dopant_results:
-                strains = [r['strain'] for r in dopant_results]
-                iprs = [r['ipr'] for r in dopant_results]
-                couplings = [r['electronic_coupling'] for r in dopant_results]
-                reorgs = [r['reorganization_energy'] for r in dopant_results]
-                
+            dopant_rows = results_index['by_dopant'].get(dopant)
+            if dopant_rows:
                 combined_effects[dopant] = {
-                    'strains': strains,
-                    'iprs': iprs,
-                    'couplings': couplings,
-                    'reorgs': reorgs,
-                    'ipr_change': max(iprs) - min(iprs),
-                    'coupling_change': max(couplings) - min(couplings),
-                    'reorg_change': max(reorgs) - min(reorgs)
+                    'strains': [records[i]['strain'] for i in dopant_rows],
+                    **self._effect_series(results_index, dopant_rows)
                 }
         
         return combined_effects
     
+    def _effect_series(self, results_index: Dict, rows: List[int]) -> Dict:
+        """从数值表中切出一组结果的 IPR/J/λ 序列，并用一次NumPy归约得到各自的变化幅度(max - min)"""
+        values = results_index['values'][rows]
+        ipr_change, coupling_change, reorg_change = _effect_range_kernel(values).tolist()
+        iprs, couplings, reorgs = values.T.tolist()
+        return {
+            'iprs': iprs,
+            'couplings': couplings,
+            'reorgs': reorgs,
+            'ipr_change': ipr_change,
+            'coupling_change': coupling_change,
+            'reorg_change': reorg_change
+        }
+    
     def _calculate_synergistic_factors(self, isolated_effects: Dict, combined_effects: Dict) -> Dict:
         """计算协同因子"""
         synergistic_factors = {}
         
-        if 'strain_only' in isolated_effects and 'doping_only' in isolated_effects:
-            strain_effects = isolated_effects['strain_only']
-            doping_effects = isolated_effects['doping_only']
+        if 'strain_only' in isolated_effects and 'doping_only' in isolated_effects and combined_effects:
+            strain_changes = np.array([isolated_effects['strain_only'][k] for k in _EFFECT_CHANGE_KEYS])
+            doping_changes = np.array([isolated_effects['doping_only'][k] for k in _EFFECT_CHANGE_KEYS])
+            combined_changes = np.array([[effect[k] for k in _EFFECT_CHANGE_KEYS] for effect in combined_effects.values()])
             
-            for dopant, combined_effect in combined_effects.items():
-                # 计算离域化因子
-                strain_ipr_change = strain_effects['ipr_change']
-                doping_ipr_change = doping_effects['ipr_change']
-                combined_ipr_change = combined_effect['ipr_change']
-                
-                expected_ipr_change = strain_ipr_change + doping_ipr_change
-                f_deloc = combined_ipr_change / expected_ipr_change if expected_ipr_change > 0 else 1.0
-                
-                # 计算耦合增强因子
-                strain_coupling_change = strain_effects['coupling_change']
-                doping_coupling_change = doping_effects['coupling_change']
-                combined_coupling_change = combined_effect['coupling_change']
-                
-                expected_coupling_change = strain_coupling_change + doping_coupling_change
-                f_coupling = combined_coupling_change / expected_coupling_change if expected_coupling_change > 0 else 1.0
-                
-                # 计算重组能因子
-                strain_reorg_change = strain_effects['reorg_change']
-                doping_reorg_change = doping_effects['reorg_change']
-                combined_reorg_change = combined_effect['reorg_change']
-                
-                expected_reorg_change = strain_reorg_change + doping_reorg_change
-                f_reorg = combined_reorg_change / expected_reorg_change if expected_reorg_change > 0 else 1.0
-                
-                # 计算总增强因子
-                f_total = f_deloc * f_coupling * f_reorg
-                
+            factors = _synergy_factor_kernel(strain_changes, doping_changes, combined_changes)
+            threshold = self.theoretical_predictions['synergistic_threshold']
+            
+            for dopant, (f_deloc, f_coupling, f_reorg, f_total) in zip(combined_effects, factors.tolist()):
                 synergistic_factors[dopant] = {
                     'f_deloc': f_deloc,
                     'f_coupling': f_coupling,
                     'f_reorg': f_reorg,
                     'f_total': f_total,
-                    'synergistic': f_total > self.theoretical_predictions['synergistic_threshold']
+                    'synergistic': f_total > threshold
                 }
         
         return synergistic_factors
@@ -661,11 +1356,12 @@ class SynergyExperimentRunner:
         synergistic_factors = analysis_results.get('synergistic_factors', {})
         
         if synergistic_factors:
-            # 计算平均协同因子
-            avg_f_deloc = np.mean([factors['f_deloc'] for factors in synergistic_factors.values()])
-            avg_f_coupling = np.mean([factors['f_coupling'] for factors in synergistic_factors.values()])
-            avg_f_reorg = np.mean([factors['f_reorg'] for factors in synergistic_factors.values()])
-            avg_f_total = np.mean([factors['f_total'] for factors in synergistic_factors.values()])
+            # 计算平均协同因子 - 一次遍历收集成 (n, 4) 数组后按列求均值
+            factor_table = np.array([
+                [factors['f_deloc'], factors['f_coupling'], factors['f_reorg'], factors['f_total']]
+                for factors in synergistic_factors.values()
+            ])
+            avg_f_deloc, avg_f_coupling, avg_f_reorg, avg_f_total = factor_table.mean(axis=0)
             
             tolerance = self.theoretical_predictions['tolerance_factor']
             
@@ -699,11 +1395,59 @@ class SynergyExperimentRunner:
         
         return validation_results
     
+    # 图表面板: 名称 -> 绘制方法名，既可组合成总图，也可单独渲染某一个面板
+    _PLOT_PANELS = {
+        'factors': '_plot_synergistic_factors',
+        'effects': '_plot_isolated_vs_combined',
+        'strength': '_plot_synergy_strength',
+        'validation': '_plot_validation_summary',
+    }
+    
     def _generate_plots(self, dft_results: Dict, analysis_results: Dict) -> Dict:
-        """生成图表"""
-        fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(15, 12))
+        """生成图表（2×2总图，四个面板依次绘制）；没有任何可绘制的分析数据时不创建图形"""
+        if not self._has_plot_data(analysis_results):
+            logger.warning("没有可绘制的分析数据（所有计算均失败？），跳过绘图")
+            return {}
+        
+        plt = _pyplot()
+        fig, axes = plt.subplots(2, 2, figsize=(15, 12))
+        
+        for ax, method_name in zip(axes.flat, self._PLOT_PANELS.values()):
+            getattr(self, method_name)(ax, analysis_results)
         
-        # 1. 协同因子比较
+        fig.tight_layout()
+        plot_file = self._summary_plot_file
+        fig.savefig(plot_file, dpi=_PLOT_DPI)
+        plt.close(fig)
+        
+        return {'plot_file': str(plot_file)}
+    
+    @staticmethod
+    def _has_plot_data(analysis_results: Dict) -> bool:
+        return any(analysis_results.get(key) for key in ('synergistic_factors', 'isolated_effects', 'combined_effects'))
+    
+    @property
+    def _summary_plot_file(self) -> Path:
+        return self.experiment_dir / "figures" / "synergy_analysis.png"
+    
+    def plot_panel(self, panel: str, analysis_results: Dict) -> str:
+        """单独渲染一个面板到 figures/synergy_<panel>.png，无需重绘整张总图"""
+        if panel not in self._PLOT_PANELS:
+            raise ValueError(f"未知的图表面板: {panel}，可选: {', '.join(self._PLOT_PANELS)}")
+        
+        plt = _pyplot()
+        fig, ax = plt.subplots(figsize=(7.5, 6))
+        getattr(self, self._PLOT_PANELS[panel])(ax, analysis_results)
+        
+        fig.tight_layout()
+        plot_file = self.experiment_dir / "figures" / f"synergy_{panel}.png"
+        fig.savefig(plot_file, dpi=_PLOT_DPI)
+        plt.close(fig)
+        
+        return str(plot_file)
+    
+    def _plot_synergistic_factors(self, ax, analysis_results: Dict):
+        """协同因子比较"""
         synergistic_factors = analysis_results['synergistic_factors']
         if synergistic_factors:
             dopants = list(synergistic_factors.keys())
@@ -715,134 +1459,111 @@ class SynergyExperimentRunner:
             x = np.arange(len(dopants))
             width = 0.2
             
-            ax1.bar(x - 1.5*width, f_deloc, width, label='f_deloc', alpha=0.7)
-            ax1.bar(x - 0.5*width, f_coupling, width, label='f_coupling', alpha=0.7)
-            ax1.bar(x + 0.5*width, f_reorg, width, label='f_reorg', alpha=0.7)
-            ax1.bar(x + 1.5*width, f_total, width, label='f_total', alpha=0.7)
+            ax.bar(x - 1.5*width, f_deloc, width, label='f_deloc', alpha=0.7)
+            ax.bar(x - 0.5*width, f_coupling, width, label='f_coupling', alpha=0.7)
+            ax.bar(x + 0.5*width, f_reorg, width, label='f_reorg', alpha=0.7)
+            ax.bar(x + 1.5*width, f_total, width, label='f_total', alpha=0.7)
             
-            ax1.axhline(y=self.theoretical_predictions['delocalization_factor'], color='r', linestyle='--', alpha=0.5, label='Theoretical f_deloc')
-            ax1.axhline(y=self.theoretical_predictions['coupling_enhancement_factor'], color='g', linestyle='--', alpha=0.5, label='Theoretical f_coupling')
-            ax1.axhline(y=self.theoretical_predictions['reorganization_factor'], color='b', linestyle='--', alpha=0.5, label='Theoretical f_reorg')
-            ax1.axhline(y=self.theoretical_predictions['total_enhancement_factor'], color='m', linestyle='--', alpha=0.5, label='Theoretical f_total')
+            ax.axhline(y=self.theoretical_predictions['delocalization_factor'], color='r', linestyle='--', alpha=0.5, label='Theoretical f_deloc')
+            ax.axhline(y=self.theoretical_predictions['coupling_enhancement_factor'], color='g', linestyle='--', alpha=0.5, label='Theoretical f_coupling')
+            ax.axhline(y=self.theoretical_predictions['reorganization_factor'], color='b', linestyle='--', alpha=0.5, label='Theoretical f_reorg')
+            ax.axhline(y=self.theoretical_predictions['total_enhancement_factor'], color='m', linestyle='--', alpha=0.5, label='Theoretical f_total')
             
-            ax1.set_xlabel('Dopant Type')
-            ax1.set_ylabel('Synergistic Factor')
-            ax1.set_title('Synergistic Factors Comparison')
-            ax1.set_xticks(x)
-            ax1.set_xticklabels(dopants)
-            ax1.legend()
-            ax1.grid(True, alpha=0.3)
-        
-        # 2. 孤立效应 vs 组合效应
+            ax.set_xlabel('Dopant Type')
+            ax.set_ylabel('Synergistic Factor')
+            ax.set_title('Synergistic Factors Comparison')
+            ax.set_xticks(x)
+            ax.set_xticklabels(dopants)
+            ax.legend()
+            ax.grid(True, alpha=0.3)
+    
+    def _plot_isolated_vs_combined(self, ax, analysis_results: Dict):
+        """孤立效应 vs 组合效应"""
         isolated_effects = analysis_results['isolated_effects']
         combined_effects = analysis_results['combined_effects']
         
         if isolated_effects and combined_effects:
             effects = ['IPR Change', 'Coupling Change', 'Reorg Change']
-            strain_only = [
-                isolated_effects['strain_only']['ipr_change'],
-                isolated_effects['strain_only']['coupling_change'],
-                isolated_effects['strain_only']['reorg_change']
-            ]
-            doping_only = [
-                isolated_effects['doping_only']['ipr_change'],
-                isolated_effects['doping_only']['coupling_change'],
-                isolated_effects['doping_only']['reorg_change']
-            ]
+            strain_only = [isolated_effects['strain_only'][k] for k in _EFFECT_CHANGE_KEYS]
+            doping_only = [isolated_effects['doping_only'][k] for k in _EFFECT_CHANGE_KEYS]
             
-            # 计算组合效应的平均值
-            combined_avg = [
-                np.mean([eff['ipr_change'] for eff in combined_effects.values()]),
-                np.mean([eff['coupling_change'] for eff in combined_effects.values()]),
-                np.mean([eff['reorg_change'] for eff in combined_effects.values()])
-            ]
+            # 计算组合效应的平均值 - 一次遍历填入连续的 (n, 3) 缓冲区后按列求均值
+            combined_avg = np.fromiter(
+                (eff[k] for eff in combined_effects.values() for k in _EFFECT_CHANGE_KEYS),
+                dtype=np.float64, count=len(_EFFECT_CHANGE_KEYS) * len(combined_effects)
+            ).reshape(-1, len(_EFFECT_CHANGE_KEYS)).mean(axis=0)
             
             x = np.arange(len(effects))
             width = 0.25
             
-            ax2.bar(x - width, strain_only, width, label='Strain Only', alpha=0.7)
-            ax2.bar(x, doping_only, width, label='Doping Only', alpha=0.7)
-            ax2.bar(x + width, combined_avg, width, label='Combined', alpha=0.7)
+            ax.bar(x - width, strain_only, width, label='Strain Only', alpha=0.7)
+            ax.bar(x, doping_only, width, label='Doping Only', alpha=0.7)
+            ax.bar(x + width, combined_avg, width, label='Combined', alpha=0.7)
             
-            ax2.set_xlabel('Effect Type')
-            ax2.set_ylabel('Change Magnitude')
-            ax2.set_title('Isolated vs Combined Effects')
-            ax2.set_xticks(x)
-            ax2.set_xticklabels(effects)
-            ax2.legend()
-            ax2.grid(True, alpha=0.3)
-        
-        # 3. 协同效应强度
+            ax.set_xlabel('Effect Type')
+            ax.set_ylabel('Change Magnitude')
+            ax.set_title('Isolated vs Combined Effects')
+            ax.set_xticks(x)
+            ax.set_xticklabels(effects)
+            ax.legend()
+            ax.grid(True, alpha=0.3)
+    
+    def _plot_synergy_strength(self, ax, analysis_results: Dict):
+        """协同效应强度"""
+        synergistic_factors = analysis_results['synergistic_factors']
         if synergistic_factors:
             dopants = list(synergistic_factors.keys())
             synergistic_strength = [factors['f_total'] for factors in synergistic_factors.values()]
             
-            bars = ax3.bar(dopants, synergistic_strength, alpha=0.7, edgecolor='black')
-            ax3.axhline(y=self.theoretical_predictions['total_enhancement_factor'], color='r', linestyle='--', label=f'Theoretical: {self.theoretical_predictions["total_enhancement_factor"]}')
-            ax3.axhline(y=self.theoretical_predictions['synergistic_threshold'], color='g', linestyle='--', label=f'Synergistic Threshold: {self.theoretical_predictions["synergistic_threshold"]}')
-            ax3.set_ylabel('Total Enhancement Factor')
-            ax3.set_title('Synergistic Effect Strength')
-            ax3.legend()
-            ax3.grid(True, alpha=0.3)
+            bars = ax.bar(dopants, synergistic_strength, alpha=0.7, edgecolor='black')
+            ax.axhline(y=self.theoretical_predictions['total_enhancement_factor'], color='r', linestyle='--', label=f'Theoretical: {self.theoretical_predictions["total_enhancement_factor"]}')
+            ax.axhline(y=self.theoretical_predictions['synergistic_threshold'], color='g', linestyle='--', label=f'Synergistic Threshold: {self.theoretical_predictions["synergistic_threshold"]}')
+            ax.set_ylabel('Total Enhancement Factor')
+            ax.set_title('Synergistic Effect Strength')
+            ax.legend()
+            ax.grid(True, alpha=0.3)
             
             # 添加数值标签
-            for bar, strength in zip(bars, synergistic_strength):
-                ax3.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 0.1, f'{strength:.2f}', ha='center', va='bottom')
-        
-        # 4. 验证结果总结
+            ax.bar_label(bars, labels=[f'{s:.2f}' for s in synergistic_strength], padding=3)
+    
+    def _plot_validation_summary(self, ax, analysis_results: Dict):
+        """验证结果总结"""
         validation_results = analysis_results['validation_metrics']
-        ax4.text(0.1, 0.8, f"Delocalization Factor Valid: {'✓' if validation_results['delocalization_factor_valid'] else '✗'}", 
-                transform=ax4.transAxes, fontsize=12, fontweight='bold')
-        ax4.text(0.1, 0.6, f"Coupling Enhancement Valid: {'✓' if validation_results['coupling_enhancement_valid'] else '✗'}", 
-                transform=ax4.transAxes, fontsize=12, fontweight='bold')
-        ax4.text(0.1, 0.4, f"Reorganization Factor Valid: {'✓' if validation_results['reorganization_factor_valid'] else '✗'}", 
-                transform=ax4.transAxes, fontsize=12, fontweight='bold')
-        ax4.text(0.1, 0.2, f"Total Enhancement Valid: {'✓' if validation_results['total_enhancement_valid'] else '✗'}", 
-                transform=ax4.transAxes, fontsize=12, fontweight='bold')
-        ax4.text(0.1, 0.0, f"Overall Valid: {'✓' if validation_results['overall_valid'] else '✗'}", 
-                transform=ax4.transAxes, fontsize=12, fontweight='bold')
-        ax4.set_title('Validation Results')
-        ax4.set_xlim(0, 1)
-        ax4.set_ylim(0, 1)
-        ax4.axis('off')
-        
-        plt.tight_layout()
-        plot_file = self.experiment_dir / "figures" / "synergy_analysis.png"
-        plt.savefig(plot_file, dpi=300, bbox_inches='tight')
-        plt.close()
-        
-        return {'plot_file': str(plot_file)}
+        # 五行结果合并为一个多行Text，只创建并排版一次
+        msg = "\n".join(f"{label}: {_TICK[bool(validation_results[key])]}"
+                        for key, label in _PLOT_VALIDATION_LABELS)
+        ax.text(0.1, 0.95, msg, transform=ax.transAxes, fontsize=12, fontweight='bold',
+                va='top', linespacing=2.0)
+        ax.set_title('Validation Results')
+        ax.set_xlim(0, 1)
+        ax.set_ylim(0, 1)
+        ax.axis('off')
+    
+    def _save_dft_results(self, dft_results: Dict) -> Path:
+        """写出DFT结果（不依赖分析结果与图表，可与绘图重叠进行）"""
+        results_dir = self.experiment_dir / "results"
+        results_dir.mkdir(parents=True, exist_ok=True)
+        dft_file = results_dir / "dft_results.json.gz"
+        _dump_json(dft_results, dft_file, compact=self.compact_numeric)
+        return dft_file
     
-    def save_results(self, dft_results: Dict, analysis_results: Dict):
-        """保存结果"""
+    def save_results(self, dft_results: Dict, analysis_results: Dict, success_count: int = None,
+                     dft_file: Path = None):
+        """保存结果（success_count 可由调用方传入已统计的成功计算数，避免重复遍历；
+        dft_file 给出时表示DFT结果已由 _save_dft_results 写出，不再重复写出）"""
         logger.info("保存实验结果...")
         
-        def convert_numpy_types(obj):
-            """转换numpy类型为Python原生类型"""
-            if isinstance(obj, np.integer):
-                return int(obj)
-            elif isinstance(obj, np.floating):
-                return float(obj)
-            elif isinstance(obj, np.ndarray):
-                return obj.tolist()
-            elif isinstance(obj, np.bool_):
-                return bool(obj)
-            elif isinstance(obj, dict):
-                return {key: convert_numpy_types(value) for key, value in obj.items()}
-            elif isinstance(obj, list):
-                return [convert_numpy_types(item) for item in obj]
-            else:
-                return obj
+        if success_count is None:
+            success_count = sum(1 for r in dft_results.values() if r['status'] == 'success')
         
         # 保存DFT结果
-        dft_file = self.experiment_dir / "results" / "dft_results.json"
-        with open(dft_file, 'w') as f:
-            json.dump(convert_numpy_types(dft_results), f, indent=2)
+        if dft_file is None:
+            dft_file = self._save_dft_results(dft_results)
+        results_dir = dft_file.parent
         
         # 保存分析结果
-        analysis_file = self.experiment_dir / "results" / "analysis_results.json"
-        with open(analysis_file, 'w') as f:
-            json.dump(convert_numpy_types(analysis_results), f, indent=2)
+        analysis_file = results_dir / "analysis_results.json"
+        _dump_json(analysis_results, analysis_file)
         
         # 保存验证报告
         validation_report = {
@@ -852,51 +1573,59 @@ class SynergyExperimentRunner:
             'validation_results': analysis_results['validation_metrics'],
             'summary': {
                 'total_calculations': len(dft_results),
-                'successful_calculations': sum(1 for r in dft_results.values() if r['status'] == 'success'),
+                'successful_calculations': success_count,
                 'dopant_types': len(self.doping_types),
                 'strain_levels': len(self.strain_values),
                 'overall_valid': analysis_results['validation_metrics']['overall_valid']
             }
         }
         
-        report_file = self.experiment_dir / "results" / "validation_report.json"
-        with open(report_file, 'w') as f:
-            json.dump(convert_numpy_types(validation_report), f, indent=2)
+        report_file = results_dir / "validation_report.json"
+        _dump_json(validation_report, report_file, indent=True)
         
-        logger.info(f"结果已保存:")
-        logger.info(f"  DFT结果: {dft_file}")
-        logger.info(f"  分析结果: {analysis_file}")
-        logger.info(f"  验证报告: {report_file}")
+        logger.info("\n".join([
+            "结果已保存:",
+            f"  DFT结果: {dft_file}",
+            f"  分析结果: {analysis_file}",
+            f"  验证报告: {report_file}",
+        ]))
     
-    def run_complete_experiment(self):
-        """运行完整实验"""
+    def run_complete_experiment(self, force: bool = False):
+        """运行完整实验（force=True 时忽略DFT结果缓存）"""
         logger.info("🚀 开始实验5: 协同效应定量验证实验")
         
         # 1. 创建DFT输入文件
         self.create_dft_input_files()
         
         # 2. 运行DFT计算
-        dft_results = self.run_dft_calculations()
-        
-        # 3. 分析结果
-        analysis_results = self.analyze_results(dft_results)
-        
-        # 4. 保存结果
-        self.save_results(dft_results, analysis_results)
+        dft_results = self.run_dft_calculations(force=force)
+        
+        # 3. 分析结果（批量扫描时可设置 SYNERGY_NOPLOT=1 跳过绘图）
+        analysis_results = self.analyze_results(dft_results, make_plots=False)
+        make_plots = not os.environ.get('SYNERGY_NOPLOT') and self._has_plot_data(analysis_results)
+        
+        # 4. 保存结果 - DFT结果在后台线程写出，与绘图重叠进行
+        # (pyplot及其全局图形管理器不是线程安全的，图表始终在主线程渲染)
+        # 分析结果与验证报告在图表保存成功后再写出，只记录真实存在的图表路径
+        success_count = self._success_count
+        with ThreadPoolExecutor(max_workers=1) as save_executor:
+            dft_future = save_executor.submit(self._save_dft_results, dft_results)
+            if make_plots:
+                analysis_results['plots'] = self._generate_plots(dft_results, analysis_results)
+            dft_file = dft_future.result()
+        self.save_results(dft_results, analysis_results, success_count, dft_file=dft_file)
         
         # 5. 输出总结
         validation_metrics = analysis_results['validation_metrics']
-        logger.info("🎯 实验5完成!")
-        logger.info(f"  总计算数: {len(dft_results)}")
-        logger.info(f"  成功计算数: {sum(1 for r in dft_results.values() if r['status'] == 'success')}")
-        logger.info(f"  掺杂类型数: {len(self.doping_types)}")
-        logger.info(f"  应变水平数: {len(self.strain_values)}")
-        logger.info(f"  离域化因子验证: {'✓' if validation_metrics['delocalization_factor_valid'] else '✗'}")
-        logger.info(f"  耦合增强验证: {'✓' if validation_metrics['coupling_enhancement_valid'] else '✗'}")
-        logger.info(f"  重组能因子验证: {'✓' if validation_metrics['reorganization_factor_valid'] else '✗'}")
-        logger.info(f"  总增强因子验证: {'✓' if validation_metrics['total_enhancement_valid'] else '✗'}")
-        logger.info(f"  协同效应验证: {'✓' if validation_metrics['synergistic_effect_valid'] else '✗'}")
-        logger.info(f"  总体验证: {'✓' if validation_metrics['overall_valid'] else '✗'}")
+        # 一次日志调用输出整段总结，而不是逐行各走一遍handler
+        logger.info("\n".join([
+            "🎯 实验5完成!",
+            f"  总计算数: {len(dft_results)}",
+            f"  成功计算数: {success_count}",
+            f"  掺杂类型数: {len(self.doping_types)}",
+            f"  应变水平数: {len(self.strain_values)}",
+            *(f"  {label}: {_TICK[bool(validation_metrics[key])]}" for key, label in _VALIDATION_LABELS),
+        ]))
         
         return {
             'dft_results': dft_results,
@@ -906,8 +1635,8 @@ class SynergyExperimentRunner:
 
 def main():
     """主函数"""
-    runner = SynergyExperimentRunner()
-    results = runner.run_complete_experiment()
+    runner = SynergyExperimentRunner(scheduler=os.environ.get('SYNERGY_SCHEDULER', 'local'))
+    results = runner.run_complete_experiment(force=bool(os.environ.get('SYNERGY_FORCE')))
     return results
 
 if __name__ == "__main__":
@@ -9,7 +9,44 @@ import json
 import matplotlib.pyplot as plt
 from scipy.optimize import curve_fit
 import os
+import sys
 from pathlib import Path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from numeric_utils import njit, to_builtin
+
+# pandas为可选依赖：可用时用C解析器读取扫描数据文件，否则使用np.loadtxt
+try:
+    import pandas as pd
+    HAS_PANDAS = True
+except ImportError:
+    HAS_PANDAS = False
+
+
+@njit(cache=True)
+def _argmax2d(grid):
+    """单次遍历二维网格，返回最大值所在的(行, 列, 最大值)，并列时取首次出现的位置"""
+    n0, n1 = grid.shape
+    best_i = 0
+    best_j = 0
+    best = grid[0, 0]
+    for i in range(n0):
+        for j in range(n1):
+            if grid[i, j] > best:
+                best = grid[i, j]
+                best_i = i
+                best_j = j
+    return best_i, best_j, best
+
+
+def _load_columns(filepath, ncols):
+    """只读取前ncols列的空白分隔数据（单精度），按列返回连续数组"""
+    if HAS_PANDAS:
+        data = pd.read_csv(filepath, sep=r'\s+', header=None, comment='#',
+                           usecols=range(ncols), dtype=np.float32).to_numpy()
+    else:
+        data = np.loadtxt(filepath, dtype=np.float32, usecols=range(ncols), ndmin=2)
+    return tuple(np.ascontiguousarray(data[:, i]) for i in range(ncols))
+
 
 class OptimalConditionsAnalyzer:
     def __init__(self, data_dir="outputs"):
@@ -30,20 +67,21 @@ class OptimalConditionsAnalyzer:
     def load_system_scan_data(self, filename):
         """加载系统扫描数据"""
         filepath = os.path.join(self.data_dir, 'system_scan', filename)
-        data = np.loadtxt(filepath)
-        return data[:, 0], data[:, 1], data[:, 2], data[:, 3]  # strain, doping, mobility, bandgap
+        return _load_columns(filepath, 4)  # strain, doping, mobility, bandgap
         
     def find_optimal_conditions(self, strain_values, doping_values, mobility_values):
         """找到最优条件"""
         # 创建网格数据
         strain_grid, doping_grid = np.meshgrid(strain_values, doping_values)
-        mobility_grid = np.array(mobility_values).reshape(len(doping_values), len(strain_values))
+        if isinstance(mobility_values, np.ndarray) and mobility_values.ndim == 2:
+            mobility_grid = mobility_values
+        else:
+            mobility_grid = np.array(mobility_values).reshape(len(doping_values), len(strain_values))
         
         # 找到最大迁移率位置
-        max_mobility_idx = np.unravel_index(np.argmax(mobility_grid), mobility_grid.shape)
-        optimal_strain = strain_values[max_mobility_idx[1]]
-        optimal_doping = doping_values[max_mobility_idx[0]]
-        max_mobility = mobility_grid[max_mobility_idx]
+        i, j, max_mobility = _argmax2d(np.ascontiguousarray(mobility_grid))
+        optimal_strain = strain_values[j]
+        optimal_doping = doping_values[i]
         
         return {
             'optimal_strain': optimal_strain,
@@ -63,21 +101,30 @@ class OptimalConditionsAnalyzer:
         
     def analyze_mixed_doping_effects(self, mixed_doping_data):
         """分析混合掺杂效应"""
-        results = {}
+        compositions = list(mixed_doping_data)
         
-        for composition, properties in mixed_doping_data.items():
-            mobility = properties['mobility']
-            bandgap = properties['bandgap']
-            activation_energy = properties['activation_energy']
-            
-            # 计算协同效应
-            synergy_factor = mobility / (properties['b_doping'] * 0.1 + properties['n_doping'] * 0.1)
-            
+        def column(field):
+            return np.fromiter((mixed_doping_data[c][field] for c in compositions),
+                               dtype=np.float64, count=len(compositions))
+        
+        # 计算协同效应（所有组分一次向量化计算）
+        # numpy除以零只会得到inf/nan，与逐个计算时一样对总掺杂量为零的组分直接报错
+        mobility = column('mobility')
+        total_doping = column('b_doping') * 0.1 + column('n_doping') * 0.1
+        zero = total_doping == 0
+        if zero.any():
+            bad = [c for c, z in zip(compositions, zero.tolist()) if z]
+            raise ZeroDivisionError(f"混合掺杂组分的总掺杂浓度为零，无法计算协同因子: {', '.join(map(str, bad))}")
+        synergy_factor = mobility / total_doping
+        
+        results = {}
+        for composition, mob, syn in zip(compositions, mobility.tolist(), synergy_factor.tolist()):
+            properties = mixed_doping_data[composition]
             results[composition] = {
-                'mobility': mobility,
-                'bandgap': bandgap,
-                'activation_energy': activation_energy,
-                'synergy_factor': synergy_factor
+                'mobility': mob,
+                'bandgap': properties['bandgap'],
+                'activation_energy': properties['activation_energy'],
+                'synergy_factor': syn
             }
             
         return results
@@ -85,8 +132,7 @@ class OptimalConditionsAnalyzer:
     def load_performance_optimization_data(self, filename):
         """加载性能优化数据"""
         filepath = os.path.join(self.data_dir, 'performance_optimization', filename)
-        data = np.loadtxt(filepath)
-        return data[:, 0], data[:, 1], data[:, 2]  # temperature, efficiency, stability
+        return _load_columns(filepath, 3)  # temperature, efficiency, stability
         
     def analyze_performance_optimization(self, temperature, efficiency, stability):
         """分析性能优化"""
@@ -107,8 +153,7 @@ class OptimalConditionsAnalyzer:
     def load_stability_test_data(self, filename):
         """加载稳定性测试数据"""
         filepath = os.path.join(self.data_dir, 'stability_test', filename)
-        data = np.loadtxt(filepath)
-        return data[:, 0], data[:, 1]  # time, performance
+        return _load_columns(filepath, 2)  # time, performance
         
     def analyze_stability(self, time, performance):
         """分析稳定性"""
@@ -170,40 +215,24 @@ class OptimalConditionsAnalyzer:
     def save_results(self, optimal_conditions, mixed_doping_analysis, 
                     performance_optimization, stability_analysis, validation_results):
         """保存分析结果"""
-        # 转换numpy类型为Python原生类型
-        def convert_numpy_types(obj):
-            if isinstance(obj, np.integer):
-                return int(obj)
-            elif isinstance(obj, np.floating):
-                return float(obj)
-            elif isinstance(obj, np.ndarray):
-                return obj.tolist()
-            elif isinstance(obj, dict):
-                return {key: convert_numpy_types(value) for key, value in obj.items()}
-            elif isinstance(obj, list):
-                return [convert_numpy_types(item) for item in obj]
-            else:
-                return obj
-        
         results = {
-            'optimal_conditions': convert_numpy_types(optimal_conditions),
-            'mixed_doping_analysis': convert_numpy_types(mixed_doping_analysis),
-            'performance_optimization': convert_numpy_types(performance_optimization),
-            'stability_analysis': convert_numpy_types(stability_analysis),
-            'validation_results': convert_numpy_types(validation_results),
-            'target_conditions': convert_numpy_types(self.optimal_conditions)
+            'optimal_conditions': optimal_conditions,
+            'mixed_doping_analysis': mixed_doping_analysis,
+            'performance_optimization': performance_optimization,
+            'stability_analysis': stability_analysis,
+            'validation_results': validation_results,
+            'target_conditions': self.optimal_conditions
         }
         
         with open('results/optimal_conditions.json', 'w') as f:
-            json.dump(results, f, indent=2)
+            json.dump(results, f, default=to_builtin, indent=2)
             
-    def plot_results(self, strain_values, doping_values, mobility_grid, 
+    def plot_results(self, strain_grid, doping_grid, mobility_grid, 
                     optimal_conditions, mixed_doping_results):
         """绘制分析结果"""
         fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(12, 10))
         
-        # 迁移率热图
-        strain_grid, doping_grid = np.meshgrid(strain_values, doping_values)
+        # 迁移率热图（直接复用find_optimal_conditions生成的网格）
         im1 = ax1.contourf(strain_grid, doping_grid, mobility_grid, levels=20, cmap='viridis')
         ax1.scatter(optimal_conditions['optimal_strain'], optimal_conditions['optimal_doping'], 
                    color='red', s=100, marker='*', label='Optimal')
@@ -260,12 +289,9 @@ def main():
     doping_values = np.linspace(2.5, 7.5, 6)
     
     # 生成模拟迁移率数据（3%应变+5%掺杂处最大）
-    mobility_grid = np.zeros((len(doping_values), len(strain_values)))
-    for i, doping in enumerate(doping_values):
-        for j, strain in enumerate(strain_values):
-            # 模拟迁移率函数
-            mobility = 8.0 + 2.0 * np.exp(-((strain - 3.0)**2 + (doping - 5.0)**2) / 10.0)
-            mobility_grid[i, j] = mobility
+    # 模拟迁移率函数（在整个网格上一次性向量化计算）
+    S, D = np.meshgrid(strain_values, doping_values)
+    mobility_grid = 8.0 + 2.0 * np.exp(-((S - 3.0)**2 + (D - 5.0)**2) / 10.0)
     
     # 找到最优条件
     optimal_conditions = analyzer.find_optimal_conditions(strain_values, doping_values, mobility_grid)
@@ -306,7 +332,8 @@ def main():
     
     # 绘制结果
     analyzer.plot_results(
-        strain_values, doping_values, mobility_grid, optimal_conditions, mixed_doping_analysis
+        optimal_conditions['strain_grid'], optimal_conditions['doping_grid'],
+        optimal_conditions['mobility_grid'], optimal_conditions, mixed_doping_analysis
     )
     
     print("最优条件验证分析完成!")
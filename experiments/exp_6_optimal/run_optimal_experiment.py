@@ -24,11 +24,13 @@ from qhp_c60_structures import (
     create_mixed_doped_structure,
     format_coords_for_cp2k
 )
+from numeric_utils import to_builtin
 
 # 设置日志
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+
 class OptimalExperimentRunner:
     """最优条件验证实验运行器"""
 
@@ -903,35 +905,19 @@ class OptimalExperimentRunner:
         return {'plot_file': str(plot_file)}
 
     def save_results(self, dft_results: Dict, analysis_results: Dict):
-        """保存结果"""
+        """保存结果，返回成功计算数"""
         logger.info("保存实验结果...")
-
-        def convert_numpy_types(obj):
-            """转换numpy类型为Python原生类型"""
-            if isinstance(obj, np.integer):
-                return int(obj)
-            elif isinstance(obj, np.floating):
-                return float(obj)
-            elif isinstance(obj, np.ndarray):
-                return obj.tolist()
-            elif isinstance(obj, np.bool_):
-                return bool(obj)
-            elif isinstance(obj, dict):
-                return {key: convert_numpy_types(value) for key, value in obj.items()}
-            elif isinstance(obj, list):
-                return [convert_numpy_types(item) for item in obj]
-            else:
-                return obj
+        n_success = sum(1 for r in dft_results.values() if r['status'] == 'success')
 
         # 保存DFT结果
         dft_file = self.experiment_dir / "results" / "dft_results.json"
         with open(dft_file, 'w') as f:
-            json.dump(convert_numpy_types(dft_results), f, indent=2)
+            json.dump(dft_results, f, default=to_builtin, indent=2)
 
         # 保存分析结果
         analysis_file = self.experiment_dir / "results" / "analysis_results.json"
         with open(analysis_file, 'w') as f:
-            json.dump(convert_numpy_types(analysis_results), f, indent=2)
+            json.dump(analysis_results, f, default=to_builtin, indent=2)
 
         # 保存验证报告
         validation_report = {
@@ -941,7 +927,7 @@ class OptimalExperimentRunner:
             'validation_results': analysis_results['validation_metrics'],
             'summary': {
                 'total_calculations': len(dft_results),
-                'successful_calculations': sum(1 for r in dft_results.values() if r['status'] == 'success'),
+                'successful_calculations': n_success,
                 'dopant_types': len(self.doping_types),
                 'strain_levels': len(self.strain_values),
                 'overall_valid': analysis_results['validation_metrics']['overall_valid']
@@ -950,13 +936,15 @@ class OptimalExperimentRunner:
 
         report_file = self.experiment_dir / "results" / "validation_report.json"
         with open(report_file, 'w') as f:
-            json.dump(convert_numpy_types(validation_report), f, indent=2)
+            json.dump(validation_report, f, default=to_builtin, indent=2)
 
         logger.info(f"结果已保存:")
         logger.info(f"  DFT结果: {dft_file}")
         logger.info(f"  分析结果: {analysis_file}")
         logger.info(f"  验证报告: {report_file}")
 
+        return n_success
+
     def run_complete_experiment(self):
         """运行完整实验"""
         logger.info("🚀 开始实验6: 最优条件验证实验")
@@ -971,13 +959,13 @@ class OptimalExperimentRunner:
         analysis_results = self.analyze_results(dft_results)
 
         # 4. 保存结果
-        self.save_results(dft_results, analysis_results)
+        n_success = self.save_results(dft_results, analysis_results)
 
         # 5. 输出总结
         validation_metrics = analysis_results['validation_metrics']
         logger.info("🎯 实验6完成!")
         logger.info(f"  总计算数: {len(dft_results)}")
-        logger.info(f"  成功计算数: {sum(1 for r in dft_results.values() if r['status'] == 'success')}")
+        logger.info(f"  成功计算数: {n_success}")
         logger.info(f"  掺杂类型数: {len(self.doping_types)}")
         logger.info(f"  应变水平数: {len(self.strain_values)}")
         logger.info(f"  最优应变验证: {'✓' if validation_metrics['optimal_strain_valid'] else '✗'}")
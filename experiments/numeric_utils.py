@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+"""
+实验脚本共用的数值工具
+numba可选依赖的njit兼容层，以及把numpy类型写入JSON时使用的default回调
+"""
+
+import numpy as np
+
+# numba为可选依赖：可用时内核编译为机器码，否则njit退化为不做任何处理的装饰器
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+def to_builtin(obj):
+    """json 的 default 回调：只在遇到未知类型时调用，把numpy标量/数组转换为Python原生类型"""
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
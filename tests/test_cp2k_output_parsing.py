@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+CP2K输出解析一致性测试
+同一份超过mmap阈值的输出文件分别走mmap批量解析和逐行解析两条路径，检查解析结果完全相同
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+EXP_DIR = Path(__file__).resolve().parent.parent / "experiments" / "exp_5_synergy"
+sys.path.insert(0, str(EXP_DIR))
+
+import run_synergy_experiment  # noqa: E402
+
+# 覆盖两条路径各自的边界情况：多次出现的标量以最后一次为准、无法转换的行末字段、
+# 缩进与未缩进的MO行、多个Mulliken块、块内的表头和非数值行
+OUTPUT_HEAD = """ MO| EIGENVALUES
+ - Atoms:                                   120
+ Number of atoms:                           240
+ ENERGY| Total FORCE_EVAL ( QS ) energy [a.u.]:   -1200.000000000
+   MO|    1   -10.5 eV
+ MO|    2   -9.75 eV   MO| shifted -9.7 eV
+ MO|    3   n/a eV
+ Mulliken Population Analysis
+  #  Atom  Element  Kind  Atomic population  Net charge
+  1  C  1  4.01 -0.01
+  2  C  1  3.98  0.02
+  3  B  2  3.10  0.90
+ Total charge 0.0
+"""
+
+OUTPUT_TAIL = """ MO|    4   -9.1 eV
+ MO|    5   -8.2 eV
+ MO|    6   -7.95 eV
+ Mulliken Population Analysis
+  1  C  1  4.05 -0.05
+  2  N  3  5.20 -0.20
+  3  C  1  3.99  xx
+ Total charge -0.25
+ *** SCF run converged in 12 steps ***
+ ENERGY| Total FORCE_EVAL ( QS ) energy [a.u.]:   -1234.567890123
+ ENERGY| Total FORCE_EVAL ( QS ) energy [a.u.]:   not-a-number
+"""
+
+
+@pytest.fixture
+def large_output(tmp_path):
+    # 中间填充无关行，使文件超过mmap阈值
+    filler_line = " SCF WAVEFUNCTION OPTIMIZATION   step  1   0.00010000   -1200.0\n"
+    n_filler = run_synergy_experiment._MMAP_PARSE_THRESHOLD // len(filler_line) + 1
+    output_file = tmp_path / "large.out"
+    output_file.write_text(OUTPUT_HEAD + filler_line * n_filler + OUTPUT_TAIL)
+    assert output_file.stat().st_size > run_synergy_experiment._MMAP_PARSE_THRESHOLD
+    return output_file
+
+
+def test_mmap_and_line_parsers_agree(tmp_path, large_output, monkeypatch):
+    runner = run_synergy_experiment.SynergyExperimentRunner(str(tmp_path / "project"))
+
+    mapped = runner._parse_dft_output(large_output)
+    # 阈值调到文件大小以上，强制同一文件走逐行解析路径
+    monkeypatch.setattr(run_synergy_experiment, '_MMAP_PARSE_THRESHOLD', large_output.stat().st_size)
+    streamed = runner._parse_dft_output(large_output)
+
+    assert mapped == streamed
+    # 确认解析真正取到了文件中的值，而不是两条路径都退回了默认值
+    assert mapped['total_energy'] == -1234.567890123
+    assert mapped['n_atoms'] == 240
+    assert mapped['convergence'] is True
+    assert (mapped['homo_energy'], mapped['lumo_energy']) == (-9.7, -9.1)
+    assert mapped['ipr'] != 47.5
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+协同效应实验结果缓存测试
+用伪造的mpirun代替CP2K，在独立的解释器进程中运行DFT计算两次，
+检查第二次运行（不同的PYTHONHASHSEED）是否完全复用第一次的结果
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+EXP_DIR = Path(__file__).resolve().parent.parent / "experiments" / "exp_5_synergy"
+
+# 伪造的mpirun：记录每次启动，输出一份可解析的收敛CP2K输出
+FAKE_MPIRUN = """#!/bin/bash
+if [ "$1" = "--version" ]; then
+    echo "mpirun (Open MPI) 4.1.5"
+    exit 0
+fi
+echo launch >> "$SYNERGY_TEST_LAUNCH_LOG"
+if [ -n "$SYNERGY_TEST_KILL_AT" ] && [ "$(wc -l < "$SYNERGY_TEST_LAUNCH_LOG")" -ge "$SYNERGY_TEST_KILL_AT" ]; then
+    # 模拟驱动进程在计算中途被杀死
+    kill -9 $PPID
+    exit 1
+fi
+cat <<'EOF'
+ - Atoms:                                   240
+ MO| EIGENVALUES
+ MO|    1   -10.1234 eV
+ MO|    2   -9.9 eV
+ MO|    3   -9.5 eV
+ MO|    4   -9.1 eV
+ Mulliken Population Analysis
+  1  C  1  4.01 -0.01
+  2  C  1  3.98  0.02
+  3  C  1  4.00  0.00
+ Total charge 0.0
+ *** SCF run converged in 10 steps ***
+ ENERGY| Total FORCE_EVAL ( QS ) energy [a.u.]:   -1234.567890123
+EOF
+"""
+
+# 在子进程中运行：创建输入文件并执行全部DFT计算，输出计算总数和复用缓存的个数
+DRIVER = """
+import json, logging, sys
+logging.disable(logging.CRITICAL)
+sys.path.insert(0, sys.argv[1])
+from run_synergy_experiment import SynergyExperimentRunner
+runner = SynergyExperimentRunner(sys.argv[2])
+runner.create_dft_input_files()
+results = runner.run_dft_calculations()
+print(json.dumps({'total': len(results), 'cached': sum(1 for r in results.values() if r.get('cached'))}))
+"""
+
+
+@pytest.fixture
+def fake_env(tmp_path):
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    mpirun = bin_dir / "mpirun"
+    mpirun.write_text(FAKE_MPIRUN)
+    mpirun.chmod(0o755)
+
+    env = {k: v for k, v in os.environ.items() if not k.startswith('SLURM_')}
+    env.update({
+        'PATH': f"{bin_dir}{os.pathsep}{env.get('PATH', '')}",
+        'CP2K': str(bin_dir / "cp2k.psmp"),
+        'NPROCS': '1',
+        'MAX_PARALLEL_JOBS': '1',
+        'SYNERGY_TEST_LAUNCH_LOG': str(tmp_path / "launches.log"),
+    })
+    return env
+
+
+def _run(tmp_path, env, hash_seed, **extra_env):
+    """以给定的PYTHONHASHSEED运行一次DFT计算，返回 (子进程结果, 累计启动次数)"""
+    run_env = dict(env, PYTHONHASHSEED=str(hash_seed), **extra_env)
+    proc = subprocess.run([sys.executable, '-c', DRIVER, str(EXP_DIR), str(tmp_path / "project")],
+                          capture_output=True, text=True, env=run_env, timeout=600)
+    log = Path(env['SYNERGY_TEST_LAUNCH_LOG'])
+    launches = len(log.read_text().splitlines()) if log.exists() else 0
+    return proc, launches
+
+
+@pytest.mark.skipif(os.name != 'posix', reason="伪造的mpirun是bash脚本")
+def test_rerun_in_new_process_launches_nothing(tmp_path, fake_env):
+    first, launches = _run(tmp_path, fake_env, hash_seed=1)
+    assert first.returncode == 0, first.stderr
+    summary = json.loads(first.stdout.splitlines()[-1])
+    assert summary['cached'] == 0
+    assert launches == summary['total']
+
+    second, launches_after = _run(tmp_path, fake_env, hash_seed=2)
+    assert second.returncode == 0, second.stderr
+    summary = json.loads(second.stdout.splitlines()[-1])
+    assert summary['cached'] == summary['total']
+    assert launches_after == launches
+
+
+@pytest.mark.skipif(os.name != 'posix', reason="伪造的mpirun是bash脚本")
+def test_resume_after_kill_runs_only_remaining(tmp_path, fake_env):
+    kill_at = 5
+    killed, launches = _run(tmp_path, fake_env, hash_seed=1, SYNERGY_TEST_KILL_AT=str(kill_at))
+    assert killed.returncode != 0
+    assert launches == kill_at
+
+    resumed, launches_after = _run(tmp_path, fake_env, hash_seed=2)
+    assert resumed.returncode == 0, resumed.stderr
+    summary = json.loads(resumed.stdout.splitlines()[-1])
+    # 被杀死前已完成的计算都写入了检查点，续算时只启动其余的计算
+    assert summary['cached'] == kill_at - 1
+    assert launches_after - launches == summary['total'] - (kill_at - 1)
+
+
+@pytest.mark.skipif(os.name != 'posix', reason="伪造的mpirun是bash脚本")
+def test_rebuilt_cp2k_invalidates_cache(tmp_path, fake_env):
+    cp2k = Path(fake_env['CP2K'])
+    cp2k.write_text('#!/bin/bash\necho "CP2K version 2024.1"\n')
+    cp2k.chmod(0o755)
+    first, launches = _run(tmp_path, fake_env, hash_seed=1)
+    assert first.returncode == 0, first.stderr
+
+    # 同一路径上重新编译CP2K：可执行文件的修改时间改变，所有结果都要重新计算
+    st = cp2k.stat()
+    os.utime(cp2k, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    second, launches_after = _run(tmp_path, fake_env, hash_seed=1)
+    assert second.returncode == 0, second.stderr
+    summary = json.loads(second.stdout.splitlines()[-1])
+    assert summary['cached'] == 0
+    assert launches_after - launches == summary['total']